@@ -2,16 +2,18 @@
 Endpoints de administrador.
 """
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Annotated
 
 from app.models.ship import ShipTemplateCreate, ShipTemplateUpdate, ShipTemplateResponse
 from app.models.board import BaseFleetCreate, BaseFleetUpdate, BaseFleetResponse
 from app.core.dependencies import get_current_admin
-from app.storage.data_models import User
+from app.storage.data_models import User, ShipTemplate, BaseFleet
 from app.storage.in_memory_store import (
     create_ship_template,
     get_ship_template,
     get_all_ship_templates,
+    get_all_ship_template_ids,
     update_ship_template,
     delete_ship_template,
     create_base_fleet,
@@ -26,6 +28,48 @@ from app.storage.in_memory_store import (
 router = APIRouter(prefix="/api/admin", tags=["Administrador"])
 
 
+def _template_to_dict(template: ShipTemplate) -> dict:
+    """Serializa una plantilla de barco con los campos de ShipTemplateResponse."""
+    return {
+        "id": template.id,
+        "name": template.name,
+        "size": template.size,
+        "description": template.description,
+        "created_by": template.created_by,
+        "created_at": template.created_at
+    }
+
+
+def _fleet_to_dict(fleet: BaseFleet) -> dict:
+    """Serializa una flota base con los campos de BaseFleetResponse."""
+    return {
+        "id": fleet.id,
+        "name": fleet.name,
+        "board_size": fleet.board_size,
+        "ship_template_ids": fleet.ship_template_ids,
+        "ship_count": fleet.ship_count,
+        "created_by": fleet.created_by,
+        "created_at": fleet.created_at
+    }
+
+
+def _to_template_response(template: ShipTemplate) -> ShipTemplateResponse:
+    """
+    Construye la respuesta de una plantilla sin revalidar sus campos.
+    
+    Los datos provienen del almacenamiento y ya fueron validados al crearse,
+    por lo que se usa model_construct.
+    """
+    return ShipTemplateResponse.model_construct(**_template_to_dict(template))
+
+
+def _to_fleet_response(fleet: BaseFleet) -> BaseFleetResponse:
+    """
+    Construye la respuesta de una flota base sin revalidar sus campos.
+    """
+    return BaseFleetResponse.model_construct(**_fleet_to_dict(fleet))
+
+
 # ==================== SHIP TEMPLATES ====================
 
 @router.post("/ship-templates", response_model=ShipTemplateResponse, status_code=status.HTTP_201_CREATED)
@@ -49,14 +93,7 @@ def create_ship_template_endpoint(
         created_by=current_admin.id
     )
     
-    return ShipTemplateResponse(
-        id=template.id,
-        name=template.name,
-        size=template.size,
-        description=template.description,
-        created_by=template.created_by,
-        created_at=template.created_at
-    )
+    return _to_template_response(template)
 
 
 @router.get("/ship-templates", response_model=List[ShipTemplateResponse])
@@ -70,17 +107,8 @@ def list_ship_templates(
     """
     templates = get_all_ship_templates()
     
-    return [
-        ShipTemplateResponse(
-            id=t.id,
-            name=t.name,
-            size=t.size,
-            description=t.description,
-            created_by=t.created_by,
-            created_at=t.created_at
-        )
-        for t in templates
-    ]
+    # Serializar directamente con orjson, sin instanciar modelos Pydantic
+    return ORJSONResponse([_template_to_dict(t) for t in templates])
 
 
 @router.get("/ship-templates/{template_id}", response_model=ShipTemplateResponse)
@@ -100,14 +128,7 @@ def get_ship_template_endpoint(
             detail="Plantilla de barco no encontrada"
         )
     
-    return ShipTemplateResponse(
-        id=template.id,
-        name=template.name,
-        size=template.size,
-        description=template.description,
-        created_by=template.created_by,
-        created_at=template.created_at
-    )
+    return _to_template_response(template)
 
 
 @router.put("/ship-templates/{template_id}", response_model=ShipTemplateResponse)
@@ -134,14 +155,7 @@ def update_ship_template_endpoint(
             detail="Plantilla de barco no encontrada"
         )
     
-    return ShipTemplateResponse(
-        id=template.id,
-        name=template.name,
-        size=template.size,
-        description=template.description,
-        created_by=template.created_by,
-        created_at=template.created_at
-    )
+    return _to_template_response(template)
 
 
 @router.delete("/ship-templates/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -166,6 +180,24 @@ def delete_ship_template_endpoint(
 
 # ==================== BASE FLEETS ====================
 
+def _check_templates_exist(template_ids: List[str]) -> None:
+    """
+    Verifica en una sola operación que todas las plantillas existen.
+    
+    Args:
+        template_ids: IDs de plantillas referenciados por la flota
+        
+    Raises:
+        HTTPException 400 si alguna plantilla no existe
+    """
+    missing = set(template_ids) - get_all_ship_template_ids()
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Plantillas de barco no encontradas: {', '.join(sorted(missing))}"
+        )
+
+
 @router.post("/base-fleets", response_model=BaseFleetResponse, status_code=status.HTTP_201_CREATED)
 def create_base_fleet_endpoint(
     fleet_data: BaseFleetCreate,
@@ -181,12 +213,7 @@ def create_base_fleet_endpoint(
     - **ship_template_ids**: IDs de las plantillas de barcos incluidas
     """
     # Verificar que todas las plantillas existen
-    for template_id in fleet_data.ship_template_ids:
-        if not get_ship_template(template_id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Plantilla de barco {template_id} no encontrada"
-            )
+    _check_templates_exist(fleet_data.ship_template_ids)
     
     # Validar capacidad de la flota (regla de negocio: máximo 80% del tablero)
     is_valid, error_message = validate_fleet_capacity(
@@ -206,15 +233,7 @@ def create_base_fleet_endpoint(
         created_by=current_admin.id
     )
     
-    return BaseFleetResponse(
-        id=fleet.id,
-        name=fleet.name,
-        board_size=fleet.board_size,
-        ship_template_ids=fleet.ship_template_ids,
-        ship_count=len(fleet.ship_template_ids),
-        created_by=fleet.created_by,
-        created_at=fleet.created_at
-    )
+    return _to_fleet_response(fleet)
 
 
 @router.get("/base-fleets", response_model=List[BaseFleetResponse])
@@ -228,18 +247,8 @@ def list_base_fleets(
     """
     fleets = get_all_base_fleets()
     
-    return [
-        BaseFleetResponse(
-            id=f.id,
-            name=f.name,
-            board_size=f.board_size,
-            ship_template_ids=f.ship_template_ids,
-            ship_count=len(f.ship_template_ids),
-            created_by=f.created_by,
-            created_at=f.created_at
-        )
-        for f in fleets
-    ]
+    # Serializar directamente con orjson, sin instanciar modelos Pydantic
+    return ORJSONResponse([_fleet_to_dict(f) for f in fleets])
 
 
 @router.get("/base-fleets/{fleet_id}", response_model=BaseFleetResponse)
@@ -259,15 +268,7 @@ def get_base_fleet_endpoint(
             detail="Flota base no encontrada"
         )
     
-    return BaseFleetResponse(
-        id=fleet.id,
-        name=fleet.name,
-        board_size=fleet.board_size,
-        ship_template_ids=fleet.ship_template_ids,
-        ship_count=len(fleet.ship_template_ids),
-        created_by=fleet.created_by,
-        created_at=fleet.created_at
-    )
+    return _to_fleet_response(fleet)
 
 
 @router.put("/base-fleets/{fleet_id}", response_model=BaseFleetResponse)
@@ -291,12 +292,7 @@ def update_base_fleet_endpoint(
     
     # Verificar plantillas si se actualizan
     if update_data.ship_template_ids:
-        for template_id in update_data.ship_template_ids:
-            if not get_ship_template(template_id):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Plantilla de barco {template_id} no encontrada"
-                )
+        _check_templates_exist(update_data.ship_template_ids)
     
     # Validar capacidad si se actualizan barcos o tamaño del tablero
     board_size = update_data.board_size if update_data.board_size else current_fleet.board_size
@@ -322,15 +318,7 @@ def update_base_fleet_endpoint(
             detail="Flota base no encontrada"
         )
     
-    return BaseFleetResponse(
-        id=fleet.id,
-        name=fleet.name,
-        board_size=fleet.board_size,
-        ship_template_ids=fleet.ship_template_ids,
-        ship_count=len(fleet.ship_template_ids),
-        created_by=fleet.created_by,
-        created_at=fleet.created_at
-    )
+    return _to_fleet_response(fleet)
 
 
 @router.delete("/base-fleets/{fleet_id}", status_code=status.HTTP_204_NO_CONTENT)
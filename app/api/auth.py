@@ -4,9 +4,9 @@ Endpoints de autenticación.
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import Annotated
 
-from app.models.user import UserCreate, UserLogin, UserResponse, TokenResponse
+from app.models.user import UserCreate, UserLogin, UserResponse, UserRole, TokenResponse
 from app.core.security import create_access_token
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, json_body, json_body_openapi
 from app.storage.data_models import User
 from app.storage.in_memory_store import (
     create_user,
@@ -18,8 +18,23 @@ from app.storage.in_memory_store import (
 router = APIRouter(prefix="/api/auth", tags=["Autenticación"])
 
 
+def _to_user_response(user: User) -> UserResponse:
+    """
+    Construye la respuesta de un usuario sin revalidar sus campos.
+    
+    Los datos provienen del almacenamiento y ya fueron validados al
+    registrarse, por lo que se usa model_construct.
+    """
+    return UserResponse.model_construct(
+        id=user.id,
+        username=user.username,
+        role=UserRole(user.role),
+        created_at=user.created_at
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate):
+async def register(user_data: UserCreate):
     """
     Registra un nuevo usuario en el sistema.
     
@@ -42,16 +57,15 @@ def register(user_data: UserCreate):
         role=user_data.role.value
     )
     
-    return UserResponse(
-        id=user.id,
-        username=user.username,
-        role=user.role,
-        created_at=user.created_at
-    )
+    return _to_user_response(user)
 
 
-@router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin):
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    openapi_extra=json_body_openapi(UserLogin)
+)
+async def login(credentials: Annotated[UserLogin, Depends(json_body(UserLogin))]):
     """
     Inicia sesión y obtiene un token de acceso.
     
@@ -80,15 +94,10 @@ def login(credentials: UserLogin):
     # Crear token
     access_token = create_access_token(data={"sub": user.id, "role": user.role})
     
-    return TokenResponse(
+    return TokenResponse.model_construct(
         access_token=access_token,
         token_type="bearer",
-        user=UserResponse(
-            id=user.id,
-            username=user.username,
-            role=user.role,
-            created_at=user.created_at
-        )
+        user=_to_user_response(user)
     )
 
 
@@ -101,9 +110,4 @@ def get_current_user_info(current_user: Annotated[User, Depends(get_current_user
     
     Retorna los datos del usuario actual basado en el token JWT.
     """
-    return UserResponse(
-        id=current_user.id,
-        username=current_user.username,
-        role=current_user.role,
-        created_at=current_user.created_at
-    )
+    return _to_user_response(current_user)
@@ -1,6 +1,7 @@
 """
 Endpoints de juego (Game).
 """
+from functools import lru_cache
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import Annotated, Optional
 
@@ -10,19 +11,57 @@ from app.models.game import (
     GameDetailResponse,
     ShotRequest,
     ShotResponse,
+    ShotResult,
     ShotHistory,
     JoinGameResponse
 )
-from app.models.ship import ShipPlacement, ShipInstance
-from app.core.dependencies import get_current_user
+from app.models.ship import ShipPlacement
+from app.core.dependencies import get_current_user, json_body, json_body_openapi
 from app.storage.data_models import User
-from app.storage.in_memory_store import get_game, get_base_fleet, get_ship_template, get_user_by_id
+from app.storage.in_memory_store import (
+    get_game,
+    get_ship_template,
+    get_catalog_version,
+    register_derived_cache,
+    delete_game as store_delete_game
+)
 from app.services.game_service import GameService
+from app.services.board_service import BoardService
 
 
 router = APIRouter(prefix="/api/game", tags=["Game"])
 
 
+@register_derived_cache
+@lru_cache(maxsize=512)
+def _build_ships_to_place(template_ids: tuple[str, ...], catalog_version: int) -> tuple[dict, ...]:
+    """
+    Construye la lista de barcos a colocar para una flota (memoizado).
+    
+    Importante: si hay barcos duplicados (mismo template_id), cada uno debe
+    aparecer. La versión del catálogo forma parte de la clave, de modo que
+    cualquier cambio en plantillas o flotas invalida las entradas previas.
+    
+    Args:
+        template_ids: IDs de plantillas de la flota base (en orden)
+        catalog_version: Versión actual del catálogo
+        
+    Returns:
+        Tupla de diccionarios compartida entre peticiones (no modificar)
+    """
+    ships_to_place = []
+    for index, template_id in enumerate(template_ids):
+        template = get_ship_template(template_id)
+        if template:
+            ships_to_place.append({
+                "id": template.id,
+                "name": template.name,
+                "size": template.size,
+                "index": index  # Identificador único para distinguir barcos del mismo tipo
+            })
+    return tuple(ships_to_place)
+
+
 @router.post("/create", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_game(
     game_data: GameCreate,
@@ -54,21 +93,10 @@ def create_game(
             detail="No se pudo crear la partida. Verifica que la flota base existe."
         )
     
-    # Obtener información de la flota base
-    base_fleet = get_base_fleet(game_data.base_fleet_id)
-    
     # Obtener información de los barcos a colocar
-    # Importante: si hay barcos duplicados (mismo template_id), cada uno debe aparecer
-    ships_to_place = []
-    for index, template_id in enumerate(result["ship_template_ids"]):
-        template = get_ship_template(template_id)
-        if template:
-            ships_to_place.append({
-                "id": template.id,
-                "name": template.name,
-                "size": template.size,
-                "index": index  # Identificador único para distinguir barcos del mismo tipo
-            })
+    ships_to_place = _build_ships_to_place(
+        tuple(result["ship_template_ids"]), get_catalog_version()
+    )
     
     message = "Partida creada. "
     if game_data.is_multiplayer:
@@ -76,13 +104,10 @@ def create_game(
     else:
         message += "Coloca tus barcos para comenzar."
     
-    # Obtener nombres de usuario
-    player1_user = get_user_by_id(result["player1_id"])
-    
     return {
         "id": result["game_id"],
         "player1_id": result["player1_id"],
-        "player1_username": player1_user.username if player1_user else "Jugador 1",
+        "player1_username": result["player1_username"] or "Jugador 1",
         "player2_id": result.get("player2_id"),
         "player2_username": None,
         "current_turn_player_id": result.get("current_turn_player_id"),
@@ -92,7 +117,7 @@ def create_game(
         "is_multiplayer": result["is_multiplayer"],
         "message": message,
         "ships_to_place": ships_to_place,
-        "created_at": get_game(result["game_id"]).created_at.isoformat()
+        "created_at": get_game(result["game_id"]).created_at_iso
     }
 
 
@@ -121,31 +146,18 @@ def join_game(
         )
     
     # Obtener información de los barcos a colocar
-    # Importante: si hay barcos duplicados (mismo template_id), cada uno debe aparecer
-    base_fleet = get_base_fleet(result["base_fleet_id"])
-    ships_to_place = []
-    for index, template_id in enumerate(result["ship_template_ids"]):
-        template = get_ship_template(template_id)
-        if template:
-            ships_to_place.append({
-                "id": template.id,
-                "name": template.name,
-                "size": template.size,
-                "index": index  # Identificador único para distinguir barcos del mismo tipo
-            })
-    
-    # Obtener nombres de usuario
-    player1_user = get_user_by_id(result["player1_id"])
-    player2_user = get_user_by_id(result["player2_id"])
+    ships_to_place = _build_ships_to_place(
+        tuple(result["ship_template_ids"]), get_catalog_version()
+    )
     
     return {
         "message": message,
         "game": {
             "id": result["game_id"],
             "player1_id": result["player1_id"],
-            "player1_username": player1_user.username if player1_user else "Jugador 1",
+            "player1_username": result["player1_username"] or "Jugador 1",
             "player2_id": result["player2_id"],
-            "player2_username": player2_user.username if player2_user else "Jugador 2",
+            "player2_username": result["player2_username"] or "Jugador 2",
             "status": result["status"],
             "board_size": result["board_size"],
             "is_multiplayer": result["is_multiplayer"]
@@ -154,11 +166,15 @@ def join_game(
     }
 
 
-@router.post("/{game_id}/place-ship", response_model=dict)
+@router.post(
+    "/{game_id}/place-ship",
+    response_model=dict,
+    openapi_extra=json_body_openapi(ShipPlacement)
+)
 def place_ship(
     game_id: str,
-    placement: ShipPlacement,
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user)],
+    placement: Annotated[ShipPlacement, Depends(json_body(ShipPlacement))]
 ):
     """
     Colocar un barco en el tablero.
@@ -184,7 +200,7 @@ def place_ship(
         )
     
     # Verificar que el jugador es parte de la partida
-    if current_user.id not in [game.player1_id, game.player2_id]:
+    if not game.has_player(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes acceso a esta partida"
@@ -204,11 +220,9 @@ def place_ship(
             detail=message
         )
     
-    # Calcular barcos restantes por colocar para este jugador
-    base_fleet = get_base_fleet(game.base_fleet_id)
+    # Barcos restantes por colocar para este jugador
     is_player1 = (current_user.id == game.player1_id)
-    ships_list = game.player1_ships if is_player1 else game.player2_ships
-    ships_remaining = len(base_fleet.ship_template_ids) - len(ships_list)
+    ships_remaining = game.player1_ships_to_place if is_player1 else game.player2_ships_to_place
     
     return {
         "message": "Barco colocado exitosamente",
@@ -224,7 +238,8 @@ def place_ship(
 @router.get("/{game_id}/board", response_model=dict)
 def get_board_state(
     game_id: str,
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user)],
+    compact: bool = False
 ):
     """
     Obtener estado actual del tablero.
@@ -235,6 +250,9 @@ def get_board_state(
     - Estado de todos los barcos
     - Segmentos y si fueron impactados
     - Estadísticas de disparos
+    
+    Con **compact=true** los barcos y disparos se reemplazan por
+    player_board y enemy_board en formato BoardViewCompact (mapas de bits).
     """
     game = get_game(game_id)
     if not game:
@@ -244,53 +262,43 @@ def get_board_state(
         )
     
     # Verificar que el jugador es parte de la partida
-    if current_user.id not in [game.player1_id, game.player2_id]:
+    if not game.has_player(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes acceso a esta partida"
         )
     
-    game_detail = GameService.get_game_detail(game_id, current_user.id)
-    if not game_detail:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No se pudo obtener el estado del juego"
-        )
-    
     # Determinar qué jugador está consultando
     is_player1 = (current_user.id == game.player1_id)
     stats = game.get_stats(current_user.id)
     
-    # Obtener disparos según el jugador
-    if is_player1:
-        my_shots = game.player1_shots
-        enemy_shots = game.player2_shots
-    else:
-        my_shots = game.player2_shots
-        enemy_shots = game.player1_shots
-    
-    # Formatear disparos
-    player_shots = [
-        {
-            "coordinate": shot.coordinate,
-            "result": shot.result,
-            "coordinate_code": shot.coordinate_code
+    if compact:
+        my_ships = game.player1_ships if is_player1 else game.player2_ships
+        shots_received = game.player2_shots if is_player1 else game.player1_shots
+        shots_fired = game.player1_shots if is_player1 else game.player2_shots
+        board_data = {
+            "player_board": BoardService.build_compact_board(
+                game.board_size,
+                (seg.coordinate_code for ship in my_ships for seg in ship.segments),
+                shots_received
+            ),
+            # Los barcos enemigos no se revelan
+            "enemy_board": BoardService.build_compact_board(game.board_size, (), shots_fired)
         }
-        for shot in my_shots
-    ]
-    
-    opponent_shots = [
-        {
-            "coordinate": shot.coordinate,
-            "result": shot.result,
-            "coordinate_code": shot.coordinate_code
+    else:
+        game_detail = GameService.get_game_detail(game_id, current_user.id)
+        if not game_detail:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No se pudo obtener el estado del juego"
+            )
+        
+        # Disparos ya serializados según el jugador
+        board_data = {
+            "player_ships": game_detail["ships"],
+            "player_shots": game.get_shot_dicts(is_player1),
+            "enemy_shots": game.get_shot_dicts(not is_player1)
         }
-        for shot in enemy_shots
-    ]
-    
-    # Obtener nombres de usuario
-    player1_user = get_user_by_id(game.player1_id)
-    player2_user = get_user_by_id(game.player2_id) if game.player2_id else None
     
     return {
         "game_id": game.id,
@@ -300,14 +308,12 @@ def get_board_state(
         "current_turn_player_id": game.current_turn_player_id,
         "is_my_turn": (game.current_turn_player_id == current_user.id),
         "winner": game.winner,
-        "player_ships": game_detail["ships"],
-        "player_shots": player_shots,
-        "enemy_shots": opponent_shots,
+        **board_data,
         "total_shots": stats["total_shots"],
         "hits": stats["hits"],
         "misses": stats["misses"],
-        "player1_username": player1_user.username if player1_user else "Jugador 1",
-        "player2_username": player2_user.username if player2_user else "Esperando..."
+        "player1_username": game.player1_username or "Jugador 1",
+        "player2_username": game.player2_username or "Esperando..."
     }
 
 
@@ -344,12 +350,7 @@ def fire_shot(
         )
     
     # Verificar que el jugador es parte de la partida
-    # En vs IA, player2_id es None, así que solo verificamos player1_id
-    valid_players = [game.player1_id]
-    if game.player2_id:
-        valid_players.append(game.player2_id)
-    
-    if current_user.id not in valid_players:
+    if not game.has_player(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes acceso a esta partida"
@@ -363,10 +364,12 @@ def fire_shot(
             detail=message
         )
     
-    return ShotResponse(
+    # El resultado lo genera el servicio, así que no se revalida campo a
+    # campo (model_construct); FastAPI lo serializa con response_model
+    return ShotResponse.model_construct(
         coordinate=result["coordinate"],
         coordinate_code=result["coordinate_code"],
-        result=result["result"],
+        result=ShotResult(result["result"]),
         ship_hit=result["ship_hit"],
         ship_sunk=result["ship_sunk"],
         game_finished=result.get("game_won", False),
@@ -398,7 +401,7 @@ def get_shots_history(
         )
     
     # Verificar que el jugador es parte de la partida
-    if current_user.id not in [game.player1_id, game.player2_id]:
+    if not game.has_player(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes acceso a esta partida"
@@ -406,17 +409,7 @@ def get_shots_history(
     
     # Obtener disparos del jugador actual
     is_player1 = (current_user.id == game.player1_id)
-    my_shots = game.player1_shots if is_player1 else game.player2_shots
-    
-    shots = [
-        {
-            "coordinate": shot.coordinate,
-            "coordinate_code": shot.coordinate_code,
-            "result": shot.result,
-            "timestamp": shot.timestamp.isoformat()
-        }
-        for shot in my_shots
-    ]
+    shots = game.get_shot_dicts(is_player1)
     
     return {
         "total": len(shots),
@@ -449,7 +442,7 @@ def get_game_stats(
         )
     
     # Verificar que el jugador es parte de la partida
-    if current_user.id not in [game.player1_id, game.player2_id]:
+    if not game.has_player(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes acceso a esta partida"
@@ -462,15 +455,8 @@ def get_game_stats(
     if stats["total_shots"] > 0:
         accuracy = (stats["hits"] / stats["total_shots"]) * 100
     
-    # Calcular duración del juego
-    from datetime import datetime
-    duration_minutes = 0
-    if game.finished_at:
-        duration = game.finished_at - game.created_at
-        duration_minutes = int(duration.total_seconds() / 60)
-    else:
-        duration = datetime.now() - game.created_at
-        duration_minutes = int(duration.total_seconds() / 60)
+    # Duración del juego (ya calculada en las estadísticas)
+    duration_minutes = stats["game_duration_seconds"] // 60
     
     return {
         "game_id": game.id,
@@ -513,15 +499,7 @@ def delete_game(
             detail="Solo el creador de la partida puede eliminarla"
         )
     
-    # Eliminar del storage
-    from app.storage.in_memory_store import games_db, player_games
-    
-    if game_id in games_db:
-        del games_db[game_id]
-    
-    # Eliminar del índice de jugador
-    if current_user.id in player_games:
-        if game_id in player_games[current_user.id]:
-            player_games[current_user.id].remove(game_id)
+    # Eliminar del storage (y del índice de partidas de ambos jugadores)
+    store_delete_game(game_id)
     
     return None
@@ -1,28 +1,32 @@
 """
 Endpoints de jugador.
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from typing import List, Annotated, Optional
+import orjson
 
 from app.models.game import (
     GameCreate,
     GameResponse,
     GameDetailResponse,
     GameListResponse,
+    GameStatus,
     ShotRequest,
     ShotResponse
 )
-from app.models.ship import ShipInstance, ShipPlacement
-from app.models.board import BaseFleetResponse
-from app.core.dependencies import get_current_user
+from app.models.board import BaseFleetResponse, AvailableFleetResponse
+from app.core.dependencies import get_current_user, get_current_user_id
 from app.storage.data_models import User
 from app.storage.in_memory_store import (
     get_base_fleet,
     get_all_base_fleets,
     get_player_games,
-    games_db,
-    get_user_by_id,
-    get_ship_template
+    get_waiting_multiplayer_games,
+    get_waiting_games_version,
+    get_ship_templates_bulk,
+    get_catalog_version,
+    register_derived_cache
 )
 from app.services.game_service import GameService
 
@@ -32,45 +36,71 @@ router = APIRouter(prefix="/api/player", tags=["Jugador"])
 
 # ==================== BASE FLEETS (READ ONLY) ====================
 
-@router.get("/available-fleets", response_model=List[BaseFleetResponse])
-def list_available_fleets(
-    current_user: Annotated[User, Depends(get_current_user)]
-):
+@register_derived_cache
+@lru_cache(maxsize=1)
+def _build_available_fleets_payload(catalog_version: int) -> bytes:
     """
-    Ver flotas base disponibles para jugar.
+    Construye el listado de flotas disponibles ya serializado (memoizado).
     
-    **Requiere autenticación.**
+    El contenido no depende del usuario, solo del catálogo; la versión del
+    catálogo forma parte de la clave y cambia con cada modificación de
+    plantillas o flotas.
+    
+    Args:
+        catalog_version: Versión actual del catálogo
+        
+    Returns:
+        Cuerpo JSON de la respuesta
     """
     fleets = get_all_base_fleets()
     
+    # Una sola búsqueda para todas las plantillas usadas por las flotas;
+    # el resumen de cada plantilla se comparte entre flotas
+    templates = get_ship_templates_bulk(
+        tid for f in fleets for tid in f.ship_template_ids
+    )
+    summaries = {
+        tid: {"id": t.id, "name": t.name, "size": t.size}
+        for tid, t in templates.items()
+    }
+    
     result = []
     for f in fleets:
-        # Obtener detalles de los barcos
-        ships = []
-        for template_id in f.ship_template_ids:
-            template = get_ship_template(template_id)
-            if template:
-                ships.append({
-                    "id": template.id,
-                    "name": template.name,
-                    "size": template.size
-                })
-        
-        fleet_response = BaseFleetResponse(
-            id=f.id,
-            name=f.name,
-            board_size=f.board_size,
-            ship_template_ids=f.ship_template_ids,
-            ship_count=len(f.ship_template_ids),
-            created_by=f.created_by,
-            created_at=f.created_at
-        )
-        # Agregar ships como atributo adicional
-        fleet_dict = fleet_response.model_dump()
-        fleet_dict['ships'] = ships
-        result.append(fleet_dict)
+        ships = [summaries[tid] for tid in f.ship_template_ids if tid in summaries]
+        result.append({
+            "id": f.id,
+            "name": f.name,
+            "board_size": f.board_size,
+            "ship_template_ids": f.ship_template_ids,
+            "ship_count": f.ship_count,
+            "created_by": f.created_by,
+            "created_at": f.created_at,
+            "ships": ships
+        })
+    
+    return orjson.dumps(result)
+
+
+@router.get(
+    "/available-fleets",
+    response_model=None,
+    responses={200: {"model": List[AvailableFleetResponse]}}
+)
+def list_available_fleets(
+    current_user: Annotated[User, Depends(get_current_user)]
+) -> Response:
+    """
+    Ver flotas base disponibles para jugar.
+    
+    **Requiere autenticación.**
     
-    return result
+    El cuerpo se sirve ya serializado desde la caché del catálogo, por lo
+    que el esquema se declara en responses y no se revalida en cada petición.
+    """
+    return Response(
+        content=_build_available_fleets_payload(get_catalog_version()),
+        media_type="application/json"
+    )
 
 
 @router.get("/base-fleets/{fleet_id}", response_model=BaseFleetResponse)
@@ -90,12 +120,13 @@ def get_fleet_details(
             detail="Flota base no encontrada"
         )
     
-    return BaseFleetResponse(
+    # Datos ya validados al crear la flota: construir sin revalidar
+    return BaseFleetResponse.model_construct(
         id=fleet.id,
         name=fleet.name,
         board_size=fleet.board_size,
         ship_template_ids=fleet.ship_template_ids,
-        ship_count=len(fleet.ship_template_ids),
+        ship_count=fleet.ship_count,
         created_by=fleet.created_by,
         created_at=fleet.created_at
     )
@@ -105,7 +136,7 @@ def get_fleet_details(
 
 @router.get("/my-games", response_model=GameListResponse)
 def list_my_games(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user_id: Annotated[str, Depends(get_current_user_id)],
     status: Optional[str] = None
 ):
     """
@@ -118,37 +149,34 @@ def list_my_games(
     Args:
         status: Filtrar por estado (opcional): 'in_progress', 'finished', 'setup'
     """
-    games = get_player_games(current_user.id)
-    
-    # Filtrar por estado si se proporciona
-    if status:
-        games = [g for g in games if g.status == status]
-    
-    games_response = []
-    for game in games:
-        stats = game.get_stats(current_user.id)
-        games_response.append(
-            GameResponse(
-                id=game.id,
-                player1_id=game.player1_id,
-                player2_id=game.player2_id,
-                current_turn_player_id=game.current_turn_player_id,
-                base_fleet_id=game.base_fleet_id,
-                board_size=game.board_size,
-                status=game.status,
-                is_multiplayer=game.is_multiplayer,
-                total_shots=stats["total_shots"],
-                hits=stats["hits"],
-                misses=stats["misses"],
-                ships_total=stats["ships_total"],
-                ships_remaining=stats["ships_remaining"],
-                ships_sunk=stats["ships_sunk"],
-                created_at=game.created_at,
-                finished_at=game.finished_at
-            )
+    # Filtrar por estado (si se proporciona) directamente en el índice
+    games = get_player_games(current_user_id, status or None)
+    
+    games_with_stats = [(game, game.get_stats(current_user_id)) for game in games]
+    # Datos internos ya validados: construir sin revalidar cada fila
+    games_response = [
+        GameResponse.model_construct(
+            id=game.id,
+            player1_id=game.player1_id,
+            player2_id=game.player2_id,
+            current_turn_player_id=game.current_turn_player_id,
+            base_fleet_id=game.base_fleet_id,
+            board_size=game.board_size,
+            status=GameStatus(game.status),
+            is_multiplayer=game.is_multiplayer,
+            total_shots=stats["total_shots"],
+            hits=stats["hits"],
+            misses=stats["misses"],
+            ships_total=stats["ships_total"],
+            ships_remaining=stats["ships_remaining"],
+            ships_sunk=stats["ships_sunk"],
+            created_at=game.created_at,
+            finished_at=game.finished_at
         )
+        for game, stats in games_with_stats
+    ]
     
-    return GameListResponse(
+    return GameListResponse.model_construct(
         total=len(games_response),
         games=games_response
     )
@@ -156,7 +184,9 @@ def list_my_games(
 
 @router.get("/available-multiplayer-games", response_model=dict)
 def list_available_multiplayer_games(
-    current_user: Annotated[User, Depends(get_current_user)],
+    request: Request,
+    response: Response,
+    current_user_id: Annotated[str, Depends(get_current_user_id)],
     limit: int = 8
 ):
     """
@@ -166,42 +196,53 @@ def list_available_multiplayer_games(
     
     Retorna partidas que están esperando un segundo jugador.
     
+    La respuesta lleva un ETag que solo cambia cuando una partida entra o
+    sale del lobby (o cambia el catálogo); si el cliente envía el mismo
+    valor en If-None-Match se responde 304 sin cuerpo.
+    
     Args:
         limit: Número máximo de partidas a retornar (default: 8)
     """
-    # Filtrar partidas multijugador esperando jugador 2
+    etag = (
+        f'W/"{get_waiting_games_version()}-{get_catalog_version()}'
+        f'-{limit}-{current_user_id}"'
+    )
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
+    
+    # Recorrer solo el índice de partidas en espera (más recientes primero)
     available_games = []
+    # Nombre y número de barcos por flota, resueltos una vez por petición
+    fleet_info: dict[str, tuple[str, int]] = {}
     
-    for game_id, game in games_db.items():
-        # Solo partidas multijugador esperando jugador 2
-        if (game.is_multiplayer and 
-            game.status == "waiting_for_player2" and 
-            game.player1_id != current_user.id):  # No mostrar propias partidas
-            
-            # Obtener info de la flota
+    for game in get_waiting_multiplayer_games():
+        # No mostrar propias partidas
+        if game.player1_id == current_user_id:
+            continue
+        
+        # Obtener info de la flota (varias partidas suelen compartirla)
+        info = fleet_info.get(game.base_fleet_id)
+        if info is None:
             fleet = get_base_fleet(game.base_fleet_id)
-            
-            # Obtener nombre del jugador 1
-            player1 = get_user_by_id(game.player1_id)
-            player1_username = player1.username if player1 else "Desconocido"
-            
-            available_games.append({
-                "id": game.id,
-                "player1_id": game.player1_id,
-                "player1_username": player1_username,
-                "board_size": game.board_size,
-                "base_fleet_name": fleet.name if fleet else "Desconocida",
-                "ship_count": len(fleet.ship_template_ids) if fleet else 0,
-                "created_at": game.created_at.isoformat(),
-                "time_waiting": (game.created_at).isoformat()  # Para calcular tiempo en frontend
-            })
-            
-            # Limitar resultados
-            if len(available_games) >= limit:
-                break
-    
-    # Ordenar por más recientes primero
-    available_games.sort(key=lambda x: x["created_at"], reverse=True)
+            info = (fleet.name, fleet.ship_count) if fleet else ("Desconocida", 0)
+            fleet_info[game.base_fleet_id] = info
+        
+        available_games.append({
+            "id": game.id,
+            "player1_id": game.player1_id,
+            "player1_username": game.player1_username or "Desconocido",
+            "board_size": game.board_size,
+            "base_fleet_name": info[0],
+            "ship_count": info[1],
+            "created_at": game.created_at_iso,
+            "time_waiting": game.created_at_iso  # Para calcular tiempo en frontend
+        })
+        
+        # Limitar resultados
+        if len(available_games) >= limit:
+            break
     
     return {
         "total": len(available_games),
@@ -1,35 +1,102 @@
 """
 Configuración de la aplicación.
 """
-from pydantic_settings import BaseSettings
-from typing import Optional
+import json
+import os
+from dataclasses import dataclass, fields
+from typing import Any, Mapping, Tuple
 
+from dotenv import dotenv_values
 
-class Settings(BaseSettings):
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Configuración de la aplicación."""
-    
+
     # Configuración del servidor
     app_env: str = "development"
     app_host: str = "0.0.0.0"
     app_port: int = 8000
-    
+
     # Configuración de logging
     log_level: str = "INFO"
-    
+
     # Configuración de seguridad
     secret_key: str = "your-secret-key-change-this-in-production-123456789"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24  # 24 horas
-    
+
+    # Orígenes permitidos por CORS (en .env como lista JSON); por defecto
+    # cualquiera, como antes de poder configurarlos
+    cors_origins: Tuple[str, ...] = ("*",)
+
     # Configuración de la aplicación
     project_name: str = "Batalla Naval API"
     version: str = "1.0.0"
     description: str = "API REST para juego de Batalla Naval con ABB y Árbol N-ario"
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """
+        Construye la configuración desde el archivo .env y las variables de entorno.
+
+        Las variables de entorno tienen prioridad sobre el archivo y los
+        nombres no distinguen mayúsculas de minúsculas.
+
+        Args:
+            env_file: Ruta del archivo .env (opcional)
+
+        Returns:
+            Configuración inmutable
+        """
+        raw: Mapping[str, Any] = {
+            key.lower(): value
+            for source in (dotenv_values(env_file), os.environ)
+            for key, value in source.items()
+            if value is not None
+        }
+
+        values = {}
+        for field in fields(cls):
+            if field.name in raw:
+                values[field.name] = _coerce(field.name, raw[field.name], field.default)
+
+        return cls(**values)
+
+
+def _coerce(name: str, value: str, default: Any) -> Any:
+    """
+    Convierte el texto de una variable al tipo del valor por defecto.
+
+    Args:
+        name: Nombre del campo (para los mensajes de error)
+        value: Texto leído del entorno
+        default: Valor por defecto del campo
+
+    Returns:
+        Valor convertido (int, tupla desde lista JSON o str)
+
+    Raises:
+        ValueError: Si el texto no tiene el formato esperado
+    """
+    if isinstance(default, int):
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{name.upper()} debe ser un entero, se recibió {value!r}") from None
+    if isinstance(default, tuple):
+        try:
+            parsed = json.loads(value)
+        except json.JSONDecodeError:
+            parsed = None
+        if not isinstance(parsed, list):
+            raise ValueError(
+                f"{name.upper()} debe ser una lista JSON (por ejemplo "
+                f'["https://a.com"]), se recibió {value!r}'
+            )
+        return tuple(parsed)
+    return value
 
 
-# Instancia global de configuración
-settings = Settings()
+# Instancia global de configuración (se lee una sola vez al importar)
+settings = Settings.from_env()
@@ -1,27 +1,85 @@
 """
 Dependencias reutilizables de FastAPI.
 """
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Annotated
+import time
+from threading import Lock
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.security import HTTPBearer
+from typing import Annotated, Awaitable, Callable, Type, TypeVar
+from cachetools import TLRUCache
+from pydantic import BaseModel, ValidationError
 
 from app.core.security import decode_access_token
 from app.storage.in_memory_store import get_user_by_id
 from app.storage.data_models import User
 
 
+class BearerToken(HTTPBearer):
+    """
+    Esquema Bearer que retorna directamente el token.
+    
+    Conserva la definición de seguridad de HTTPBearer en OpenAPI, pero lee el
+    header sin construir HTTPAuthorizationCredentials en cada petición.
+    """
+    
+    async def __call__(self, request: Request) -> str:
+        """
+        Extrae el token del header Authorization.
+        
+        Args:
+            request: Petición entrante
+        
+        Returns:
+            Token JWT sin el prefijo "Bearer "
+        
+        Raises:
+            HTTPException 401: Si falta el header o el esquema no es Bearer
+        """
+        authorization = request.headers.get("authorization", "")
+        if authorization.startswith("Bearer "):
+            token = authorization[7:]
+        else:
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() != "bearer":
+                token = ""
+        
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="No autenticado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        return token
+
+
 # Esquema de seguridad Bearer
-security = HTTPBearer()
+security = BearerToken()
+
+# Tokens ya verificados: token JWT -> (User, exp). Cada entrada vive como
+# máximo 60 s y nunca más allá de la expiración del propio token
+_TOKEN_CACHE_TTL = 60
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=10000,
+    ttu=lambda _token, entry, now: min(now + _TOKEN_CACHE_TTL, entry[1]),
+    timer=time.time
+)
+_token_cache_lock = Lock()
 
 
 def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+    token: Annotated[str, Depends(security)]
 ) -> User:
     """
     Obtiene el usuario actual desde el token JWT.
     
+    Las verificaciones exitosas se guardan por token (ver _token_cache), de
+    modo que las consultas repetidas del cliente no vuelven a verificar la
+    firma ni a consultar el almacenamiento.
+    
     Args:
-        credentials: Credenciales HTTP Bearer
+        token: Token JWT del header Authorization
     
     Returns:
         Usuario autenticado
@@ -29,7 +87,11 @@ def get_current_user(
     Raises:
         HTTPException: Si el token es inválido o el usuario no existe
     """
-    token = credentials.credentials
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+    if entry is not None:
+        return entry[0]
+    
     payload = decode_access_token(token)
     
     user_id: str = payload.get("sub")
@@ -48,9 +110,32 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        with _token_cache_lock:
+            _token_cache[token] = (user, expires_at)
+    
     return user
 
 
+def get_current_user_id(
+    token: Annotated[str, Depends(security)]
+) -> str:
+    """
+    Obtiene solo el ID del usuario actual.
+    
+    Para endpoints que no necesitan otros datos del usuario; comparte la
+    caché de tokens verificados con get_current_user.
+    
+    Args:
+        token: Token JWT del header Authorization
+    
+    Returns:
+        ID del usuario autenticado
+    """
+    return get_current_user(token).id
+
+
 def get_current_admin(
     current_user: Annotated[User, Depends(get_current_user)]
 ) -> User:
@@ -97,3 +182,55 @@ def get_current_player(
         )
     
     return current_user
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def json_body(model: Type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """
+    Crea una dependencia que valida el cuerpo JSON directamente desde bytes.
+    
+    FastAPI decodifica el cuerpo con json.loads y luego valida el dict
+    resultante; model_validate_json hace ambas cosas en una sola pasada sin
+    el dict intermedio. Los errores se reportan como los de FastAPI (422 con
+    loc bajo "body").
+    
+    Usar junto con json_body_openapi para documentar el cuerpo en OpenAPI.
+    
+    Args:
+        model: Modelo Pydantic del cuerpo
+    
+    Returns:
+        Dependencia que retorna la instancia validada
+    """
+    async def parse_body(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+    
+    return parse_body
+
+
+def json_body_openapi(model: Type[BaseModel]) -> dict:
+    """
+    Describe en OpenAPI un cuerpo leído con json_body.
+    
+    Args:
+        model: Modelo Pydantic del cuerpo
+    
+    Returns:
+        Valor para el parámetro openapi_extra de la ruta
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()}
+            }
+        }
+    }
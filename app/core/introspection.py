@@ -0,0 +1,49 @@
+"""
+Caché de introspección de dependencias de FastAPI.
+
+En cada petición, ``solve_dependencies`` vuelve a preguntar si cada
+dependencia es una corrutina o un generador (``inspect.iscoroutinefunction``
+y similares). La respuesta nunca cambia para un mismo callable, así que se
+memoiza. Versiones más recientes de FastAPI ya lo hacen internamente; esta
+aplicación está fijada a 0.115.
+"""
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi.dependencies import utils as dependency_utils
+
+
+_CACHED_CHECKS = ("is_coroutine_callable", "is_gen_callable", "is_async_gen_callable")
+
+
+def _memoize_check(check: Callable[[Callable[..., Any]], bool]) -> Callable[[Callable[..., Any]], bool]:
+    """
+    Envuelve una función de introspección con una caché por callable.
+
+    Args:
+        check: Función original de FastAPI
+
+    Returns:
+        Función equivalente memoizada (con respaldo para callables no hashables)
+    """
+    cached = lru_cache(maxsize=1024)(check)
+
+    def wrapper(call: Callable[..., Any]) -> bool:
+        try:
+            return cached(call)
+        except TypeError:
+            return check(call)
+
+    wrapper.__wrapped__ = check
+    return wrapper
+
+
+def install_dependency_introspection_cache() -> None:
+    """
+    Instala la caché en ``fastapi.dependencies.utils`` (idempotente).
+    """
+    for name in _CACHED_CHECKS:
+        original = getattr(dependency_utils, name)
+        if hasattr(original, "__wrapped__"):
+            continue
+        setattr(dependency_utils, name, _memoize_check(original))
@@ -1,27 +1,38 @@
 """
 Punto de entrada de la aplicación FastAPI - Batalla Naval.
 """
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
+from app.core.introspection import install_dependency_introspection_cache
 from app.api import auth, admin, player, game
 
 
+# Memoizar la introspección de dependencias que FastAPI repite en cada petición
+install_dependency_introspection_cache()
+
 # Crear instancia de FastAPI
 app = FastAPI(
     title=settings.project_name,
     version=settings.version,
     description=settings.description,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # Serializar todas las respuestas con orjson
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # En producción, especificar orígenes permitidos
-    allow_credentials=True,
+    # Orígenes desde CORS_ORIGINS ("*" por defecto). La autenticación viaja
+    # en el header Authorization, no en cookies, así que no hacen falta
+    # credenciales.
+    allow_origins=settings.cors_origins,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -33,6 +44,32 @@ app.include_router(player.router)
 app.include_router(game.router)
 
 
+# Respuestas estáticas: se serializan una sola vez al importar el módulo
+_ROOT_JSON = orjson.dumps({
+    "message": "Bienvenido a la API de Batalla Naval",
+    "version": settings.version,
+    "description": settings.description,
+    "docs": "/docs",
+    "redoc": "/redoc",
+    "features": {
+        "abb": "Árbol Binario de Búsqueda para coordenadas del tablero",
+        "n_ary_tree": "Árbol N-ario (First-Child, Next-Sibling) para gestión de flota",
+        "roles": ["admin", "player"],
+        "storage": "En memoria (sin base de datos)"
+    },
+    "default_credentials": {
+        "username": "admin",
+        "password": "admin123",
+        "role": "admin"
+    }
+})
+
+_HEALTH_JSON = orjson.dumps({
+    "status": "healthy",
+    "environment": settings.app_env
+})
+
+
 @app.get("/", tags=["Root"])
 def root():
     """
@@ -40,24 +77,7 @@ def root():
     
     Retorna información básica de la API.
     """
-    return {
-        "message": "Bienvenido a la API de Batalla Naval",
-        "version": settings.version,
-        "description": settings.description,
-        "docs": "/docs",
-        "redoc": "/redoc",
-        "features": {
-            "abb": "Árbol Binario de Búsqueda para coordenadas del tablero",
-            "n_ary_tree": "Árbol N-ario (First-Child, Next-Sibling) para gestión de flota",
-            "roles": ["admin", "player"],
-            "storage": "En memoria (sin base de datos)"
-        },
-        "default_credentials": {
-            "username": "admin",
-            "password": "admin123",
-            "role": "admin"
-        }
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
 @app.get("/health", tags=["Health"])
@@ -67,10 +87,7 @@ def health_check():
     
     Retorna el estado de la API.
     """
-    return {
-        "status": "healthy",
-        "environment": settings.app_env
-    }
+    return Response(content=_HEALTH_JSON, media_type="application/json")
 
 
 if __name__ == "__main__":
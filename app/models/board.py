@@ -1,9 +1,10 @@
 """
 Modelos Pydantic para tableros y flotas base.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import List, Optional
+from typing_extensions import TypedDict
 
 
 class BaseFleetCreate(BaseModel):
@@ -76,16 +77,30 @@ class BaseFleetResponse(BaseModel):
     }
 
 
-class BoardCell(BaseModel):
-    """Modelo para una celda del tablero."""
-    coordinate: str = Field(description="Coordenada en formato A1")
-    coordinate_code: int = Field(description="Código numérico de la coordenada")
-    has_ship: bool = Field(default=False, description="Indica si hay un barco")
-    is_shot: bool = Field(default=False, description="Indica si fue disparada")
-    is_hit: bool = Field(default=False, description="Indica si fue un impacto")
+class FleetShipSummary(BaseModel):
+    """Resumen de un barco dentro de una flota disponible."""
+    id: str = Field(description="ID de la plantilla de barco")
+    name: str = Field(description="Nombre del barco")
+    size: int = Field(description="Tamaño del barco")
+
+
+class AvailableFleetResponse(BaseFleetResponse):
+    """Flota base disponible para jugar, con el resumen de sus barcos."""
+    ships: List[FleetShipSummary] = Field(description="Barcos de la flota, en orden")
+
+
+# Diccionario tipado en lugar de modelo: un tablero de 20x20 tiene 400 celdas
+# y como dict cada una es un solo objeto que orjson serializa directamente
+class BoardCell(TypedDict):
+    """Celda del tablero."""
+    coordinate: str  # Coordenada en formato A1
+    coordinate_code: int  # Código numérico de la coordenada
+    has_ship: bool  # Indica si hay un barco
+    is_shot: bool  # Indica si fue disparada
+    is_hit: bool  # Indica si fue un impacto
     
-    model_config = {
-        "json_schema_extra": {
+    __pydantic_config__ = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "coordinate": "A1",
@@ -96,7 +111,7 @@ class BoardCell(BaseModel):
                 }
             ]
         }
-    }
+    )
 
 
 class BoardView(BaseModel):
@@ -122,3 +137,16 @@ class BoardView(BaseModel):
             ]
         }
     }
+
+
+class BoardViewCompact(BaseModel):
+    """
+    Tablero como mapas de bits en base64 (una celda por bit).
+    
+    La celda de la fila r y columna c (ambas desde 1) ocupa el bit
+    i = (r - 1) * board_size + (c - 1): bit i % 8 del byte i // 8.
+    """
+    board_size: int = Field(description="Tamaño del tablero")
+    has_ship_bits: str = Field(description="Celdas con barco (todo en cero en el tablero enemigo)")
+    is_shot_bits: str = Field(description="Celdas disparadas")
+    is_hit_bits: str = Field(description="Celdas con impacto")
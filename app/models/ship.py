@@ -6,6 +6,20 @@ from datetime import datetime
 from typing import Optional, List
 
 
+# Ejemplos compartidos por los json_schema_extra de varios modelos
+_SHIP_TEMPLATE_EXAMPLE = {
+    "name": "Portaaviones",
+    "size": 5,
+    "description": "El barco más grande de la flota"
+}
+
+_SHIP_SEGMENT_EXAMPLE = {
+    "coordinate": "A1",
+    "coordinate_code": 11,
+    "is_hit": False
+}
+
+
 class ShipTemplateCreate(BaseModel):
     """Modelo para crear una plantilla de barco."""
     name: str = Field(min_length=1, max_length=50, description="Nombre del tipo de barco")
@@ -14,13 +28,7 @@ class ShipTemplateCreate(BaseModel):
     
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "name": "Portaaviones",
-                    "size": 5,
-                    "description": "El barco más grande de la flota"
-                }
-            ]
+            "examples": [_SHIP_TEMPLATE_EXAMPLE]
         }
     }
 
@@ -58,9 +66,7 @@ class ShipTemplateResponse(BaseModel):
             "examples": [
                 {
                     "id": "550e8400-e29b-41d4-a716-446655440001",
-                    "name": "Portaaviones",
-                    "size": 5,
-                    "description": "El barco más grande de la flota",
+                    **_SHIP_TEMPLATE_EXAMPLE,
                     "created_by": "550e8400-e29b-41d4-a716-446655440000",
                     "created_at": "2024-01-01T12:00:00"
                 }
@@ -77,13 +83,7 @@ class ShipSegment(BaseModel):
     
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "coordinate": "A1",
-                    "coordinate_code": 11,
-                    "is_hit": False
-                }
-            ]
+            "examples": [_SHIP_SEGMENT_EXAMPLE]
         }
     }
 
@@ -104,7 +104,7 @@ class ShipInstance(BaseModel):
                     "ship_name": "Portaaviones",
                     "size": 5,
                     "segments": [
-                        {"coordinate": "A1", "coordinate_code": 11, "is_hit": False},
+                        _SHIP_SEGMENT_EXAMPLE,
                         {"coordinate": "A2", "coordinate_code": 12, "is_hit": True}
                     ],
                     "is_sunk": False
@@ -7,6 +7,15 @@ from datetime import datetime
 from typing import Optional
 
 
+# Ejemplo compartido por UserResponse y TokenResponse
+_USER_RESPONSE_EXAMPLE = {
+    "id": "550e8400-e29b-41d4-a716-446655440000",
+    "username": "jugador1",
+    "role": "player",
+    "created_at": "2024-01-01T12:00:00"
+}
+
+
 class UserRole(str, Enum):
     """Roles de usuario en el sistema."""
     ADMIN = "admin"
@@ -58,14 +67,7 @@ class UserResponse(BaseModel):
     
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "id": "550e8400-e29b-41d4-a716-446655440000",
-                    "username": "jugador1",
-                    "role": "player",
-                    "created_at": "2024-01-01T12:00:00"
-                }
-            ]
+            "examples": [_USER_RESPONSE_EXAMPLE]
         }
     }
 
@@ -82,12 +84,7 @@ class TokenResponse(BaseModel):
                 {
                     "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
                     "token_type": "bearer",
-                    "user": {
-                        "id": "550e8400-e29b-41d4-a716-446655440000",
-                        "username": "jugador1",
-                        "role": "player",
-                        "created_at": "2024-01-01T12:00:00"
-                    }
+                    "user": _USER_RESPONSE_EXAMPLE
                 }
             ]
         }
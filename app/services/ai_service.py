@@ -3,13 +3,121 @@ Servicio de Inteligencia Artificial para el juego de Batalla Naval.
 Implementa estrategias de colocación de barcos y disparo.
 """
 import random
-from typing import List, Tuple, Optional
-from app.structures.coordinate_utils import (
-    coordinate_to_code,
-    code_to_coordinate,
-    validate_coordinate,
-    get_adjacent_coordinates
-)
+from functools import lru_cache
+from itertools import compress
+from operator import itemgetter
+from typing import Callable, Dict, List, Tuple, Optional
+from app.structures.coordinate_utils import ROW_LETTERS, generate_coordinate_codes
+
+
+# Generador propio del servicio (sin pasar por las funciones del módulo random)
+_rng = random.Random()
+
+# Tabla para bytes.translate: celda libre (0) -> 1, disparada (1) -> 0
+_FREE_CELL = bytes([1]) + bytes(255)
+
+
+@lru_cache(maxsize=32)
+def _coordinate_grid(board_size: int) -> Tuple[str, ...]:
+    """
+    Todas las coordenadas del tablero en orden fila a fila (memoizado).
+    
+    Args:
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Tupla de coordenadas ("A1", "A2", ...)
+    """
+    return tuple(
+        f"{ROW_LETTERS[row - 1]}{col}"
+        for row in range(1, board_size + 1)
+        for col in range(1, board_size + 1)
+    )
+
+
+@lru_cache(maxsize=32)
+def _code_grid(board_size: int) -> Tuple[int, ...]:
+    """
+    Código de cada celda del tablero en orden fila a fila (memoizado).
+    
+    Args:
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Tupla de códigos, indexada por celda igual que _coordinate_grid
+    """
+    return tuple(generate_coordinate_codes(board_size))
+
+
+@lru_cache(maxsize=32)
+def _checkerboard_cells(board_size: int) -> Tuple[int, ...]:
+    """
+    Índices de celda del patrón de ajedrez (fila + columna par), memoizado.
+    
+    Args:
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Tupla de índices en _coordinate_grid
+    """
+    return tuple(
+        (row - 1) * board_size + col - 1
+        for row in range(1, board_size + 1)
+        for col in range(1, board_size + 1)
+        if (row + col) % 2 == 0
+    )
+
+
+@lru_cache(maxsize=32)
+def _checkerboard_getter(board_size: int) -> Callable[[bytes], Tuple[int, ...]]:
+    """
+    Extractor de las celdas del patrón de ajedrez de un mapa de bytes, memoizado.
+    
+    Args:
+        board_size: Tamaño del tablero (>= 5, siempre más de una celda)
+    
+    Returns:
+        itemgetter que devuelve los bytes de _checkerboard_cells en orden
+    """
+    return itemgetter(*_checkerboard_cells(board_size))
+
+
+@lru_cache(maxsize=32)
+def _coordinate_index(board_size: int) -> Dict[str, int]:
+    """
+    Índice de celda (fila a fila) de cada coordenada, memoizado.
+    
+    Args:
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Diccionario coordenada -> índice en _coordinate_grid
+    """
+    return {coord: i for i, coord in enumerate(_coordinate_grid(board_size))}
+
+
+@lru_cache(maxsize=32)
+def _neighbour_table(board_size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Vecinos ortogonales de cada celda dentro del tablero, memoizado.
+    
+    Args:
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Para cada índice de celda, los índices de sus vecinos
+        (derecha, izquierda, abajo, arriba) que caen en el tablero
+    """
+    table = []
+    for row in range(board_size):
+        for col in range(board_size):
+            neighbours = []
+            for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                r, c = row + dr, col + dc
+                if 0 <= r < board_size and 0 <= c < board_size:
+                    neighbours.append(r * board_size + c)
+            table.append(tuple(neighbours))
+    return tuple(table)
 
 
 class AIService:
@@ -27,14 +135,23 @@ class AIService:
         Args:
             ship_templates: Lista de plantillas de barcos a colocar
             board_size: Tamaño del tablero
-            occupied_coordinates: Coordenadas ya ocupadas (opcional)
+            occupied_coordinates: Códigos ya ocupados (opcional); si se
+                indica, se amplía con las celdas de los barcos colocados
         
         Returns:
             Lista de barcos colocados con formato:
             [{"template_id": "...", "start": "A1", "orientation": "horizontal"}, ...]
         """
-        if occupied_coordinates is None:
-            occupied_coordinates = set()
+        # Ocupación como una celda por byte: índice (fila-1)*N + (columna-1);
+        # las colisiones se comprueban solo sobre este mapa
+        multiplier = 100 if board_size >= 10 else 10
+        grid = bytearray(board_size * board_size)
+        for code in occupied_coordinates or ():
+            row, col = divmod(code, multiplier)
+            if 1 <= row <= board_size and 1 <= col <= board_size:
+                grid[(row - 1) * board_size + col - 1] = 1
+        all_coordinates = _coordinate_grid(board_size)
+        all_codes = _code_grid(board_size)
         
         placed_ships = []
         
@@ -46,46 +163,50 @@ class AIService:
             
             for _ in range(max_attempts):
                 # Elegir orientación aleatoria
-                orientation = random.choice(["horizontal", "vertical"])
+                orientation = "horizontal" if _rng.random() < 0.5 else "vertical"
                 
-                # Elegir coordenada inicial aleatoria
+                # Elegir celda inicial aleatoria; el paso recorre el barco
+                # dentro del grid (1 = misma fila, N = misma columna)
                 if orientation == "horizontal":
                     max_row = board_size
                     max_col = board_size - ship_size + 1
+                    step = 1
                 else:
                     max_row = board_size - ship_size + 1
                     max_col = board_size
+                    step = board_size
                 
-                row = random.randint(1, max_row)
-                col = random.randint(1, max_col)
+                if max_row < 1 or max_col < 1:
+                    # El barco no cabe en esta orientación
+                    continue
                 
-                # Convertir a coordenada
-                letter = chr(ord('A') + row - 1)
-                start_coord = f"{letter}{col}"
+                row = _rng.randrange(1, max_row + 1)
+                col = _rng.randrange(1, max_col + 1)
+                start = (row - 1) * board_size + col - 1
                 
-                # Validar que no se superponga
-                try:
-                    coords = get_adjacent_coordinates(start_coord, board_size, orientation, ship_size)
-                    
-                    # Verificar si alguna coordenada está ocupada
-                    coords_codes = {coordinate_to_code(c, board_size) for c in coords}
-                    if not coords_codes.intersection(occupied_coordinates):
-                        # Colocar barco
-                        placed_ships.append({
-                            "template_id": ship_id,
-                            "start": start_coord,
-                            "orientation": orientation,
-                            "coordinates": coords
-                        })
-                        
-                        # Marcar coordenadas como ocupadas
-                        occupied_coordinates.update(coords_codes)
-                        placed = True
-                        break
-                        
-                except ValueError:
-                    # Coordenada inválida, intentar de nuevo
+                # Verificar si alguna celda está ocupada (rebanada del grid,
+                # comprobada en C)
+                ship_slice = slice(start, start + step * ship_size, step)
+                if 1 in grid[ship_slice]:
                     continue
+                
+                # Colocar barco (una asignación sobre la misma rebanada)
+                grid[ship_slice] = b"\x01" * ship_size
+                cells = range(start, start + step * ship_size, step)
+                coords = [all_coordinates[i] for i in cells]
+                placed_ships.append({
+                    "template_id": ship_id,
+                    "start": coords[0],
+                    "orientation": orientation,
+                    "coordinates": coords
+                })
+                
+                # Devolver los códigos ocupados si el llamador los pidió
+                # (por índice de celda, sin volver a analizar coordenadas)
+                if occupied_coordinates is not None:
+                    occupied_coordinates.update(all_codes[i] for i in cells)
+                placed = True
+                break
             
             if not placed:
                 raise Exception(f"No se pudo colocar el barco {ship_id} después de {max_attempts} intentos")
@@ -95,7 +216,7 @@ class AIService:
     @staticmethod
     def get_next_shot(
         board_size: int,
-        shots_history: List[dict],
+        shot_cells: bytearray,
         last_hits: List[str] = None,
         difficulty: str = "medium"
     ) -> str:
@@ -104,48 +225,46 @@ class AIService:
         
         Args:
             board_size: Tamaño del tablero
-            shots_history: Historial de disparos [{"coordinate": "A1", "result": "water"}, ...]
+            shot_cells: Celdas ya disparadas, un byte por celda en orden fila a
+                fila (ver BoardTree.shot_cells); el llamador lo mantiene
             last_hits: Lista de impactos recientes sin hundir
             difficulty: Nivel de dificultad ("easy", "medium", "hard")
         
         Returns:
             Coordenada a disparar (ej: "B5")
         """
-        # Crear set de coordenadas ya disparadas
-        shot_coords = {shot["coordinate"] for shot in shots_history}
-        
         # Estrategia según dificultad
         if difficulty == "hard" and last_hits:
             # Modo cazador: hay impactos sin hundir
-            coord = AIService._hunt_mode(board_size, shot_coords, last_hits)
+            coord = AIService._hunt_mode(board_size, shot_cells, last_hits)
             if coord:
                 return coord
         
         elif difficulty == "medium" and last_hits:
             # 70% probabilidad de modo cazador
-            if random.random() < 0.7:
-                coord = AIService._hunt_mode(board_size, shot_coords, last_hits)
+            if _rng.random() < 0.7:
+                coord = AIService._hunt_mode(board_size, shot_cells, last_hits)
                 if coord:
                     return coord
         
         # Modo búsqueda: disparo aleatorio o en patrón
         if difficulty == "hard":
             # Patrón de tablero de ajedrez para ser más eficiente
-            coord = AIService._checkerboard_pattern(board_size, shot_coords)
+            coord = AIService._checkerboard_pattern(board_size, shot_cells)
             if coord:
                 return coord
         
         # Disparo completamente aleatorio
-        return AIService._random_shot(board_size, shot_coords)
+        return AIService._random_shot(board_size, shot_cells)
     
     @staticmethod
-    def _hunt_mode(board_size: int, shot_coords: set, last_hits: List[str]) -> Optional[str]:
+    def _hunt_mode(board_size: int, shot_cells: bytearray, last_hits: List[str]) -> Optional[str]:
         """
         Modo cazador: dispara alrededor de impactos recientes.
         
         Args:
             board_size: Tamaño del tablero
-            shot_coords: Coordenadas ya disparadas
+            shot_cells: Celdas ya disparadas (un byte por celda)
             last_hits: Lista de impactos recientes
         
         Returns:
@@ -153,87 +272,63 @@ class AIService:
         """
         # Obtener el último impacto
         last_hit = last_hits[-1]
+        index = _coordinate_index(board_size).get(last_hit)
+        if index is None:
+            return None
         
-        # Intentar disparar en las 4 direcciones (arriba, abajo, izquierda, derecha)
-        directions = [
-            (0, 1),   # Derecha
-            (0, -1),  # Izquierda
-            (1, 0),   # Abajo
-            (-1, 0)   # Arriba
+        # Vecinos precalculados (derecha, izquierda, abajo, arriba) dentro
+        # del tablero; se elige uno libre al azar (equivale a barajar las
+        # direcciones y tomar el primero libre, sin barajar)
+        candidates = [
+            neighbour for neighbour in _neighbour_table(board_size)[index]
+            if not shot_cells[neighbour]
         ]
         
-        # Convertir coordenada a índices
-        letter = last_hit[0]
-        number = int(last_hit[1:])
-        row = ord(letter) - ord('A') + 1
-        col = number
-        
-        # Barajar direcciones para variar
-        random.shuffle(directions)
-        
-        for dr, dc in directions:
-            new_row = row + dr
-            new_col = col + dc
-            
-            # Validar que esté dentro del tablero
-            if 1 <= new_row <= board_size and 1 <= new_col <= board_size:
-                new_letter = chr(ord('A') + new_row - 1)
-                new_coord = f"{new_letter}{new_col}"
-                
-                if new_coord not in shot_coords:
-                    return new_coord
-        
-        return None
+        return _coordinate_grid(board_size)[_rng.choice(candidates)] if candidates else None
     
     @staticmethod
-    def _checkerboard_pattern(board_size: int, shot_coords: set) -> Optional[str]:
+    def _checkerboard_pattern(board_size: int, shot_cells: bytearray) -> Optional[str]:
         """
         Dispara en patrón de tablero de ajedrez (más eficiente).
         
         Args:
             board_size: Tamaño del tablero
-            shot_coords: Coordenadas ya disparadas
+            shot_cells: Celdas ya disparadas (un byte por celda)
         
         Returns:
             Coordenada a disparar o None
         """
-        candidates = []
-        
-        for row in range(1, board_size + 1):
-            for col in range(1, board_size + 1):
-                # Patrón de ajedrez: suma de fila+columna es par
-                if (row + col) % 2 == 0:
-                    letter = chr(ord('A') + row - 1)
-                    coord = f"{letter}{col}"
-                    
-                    if coord not in shot_coords:
-                        candidates.append(coord)
+        # Patrón de ajedrez precalculado: suma de fila+columna es par.
+        # translate/itemgetter/compress filtran las celdas libres en C.
+        free = shot_cells.translate(_FREE_CELL)
+        candidates = list(compress(
+            _checkerboard_cells(board_size),
+            _checkerboard_getter(board_size)(free)
+        ))
         
-        return random.choice(candidates) if candidates else None
+        return _coordinate_grid(board_size)[_rng.choice(candidates)] if candidates else None
     
     @staticmethod
-    def _random_shot(board_size: int, shot_coords: set) -> str:
+    def _random_shot(board_size: int, shot_cells: bytearray) -> str:
         """
         Disparo completamente aleatorio.
         
         Args:
             board_size: Tamaño del tablero
-            shot_coords: Coordenadas ya disparadas
+            shot_cells: Celdas ya disparadas (un byte por celda)
         
         Returns:
             Coordenada a disparar
         """
-        max_attempts = board_size * board_size
+        # Elegir entre las celdas libres (no hay intentos fallidos aunque
+        # queden pocas)
+        candidates = list(compress(
+            range(len(shot_cells)),
+            shot_cells.translate(_FREE_CELL)
+        ))
         
-        for _ in range(max_attempts):
-            row = random.randint(1, board_size)
-            col = random.randint(1, board_size)
-            
-            letter = chr(ord('A') + row - 1)
-            coord = f"{letter}{col}"
-            
-            if coord not in shot_coords:
-                return coord
+        if not candidates:
+            # El tablero está lleno (no debería pasar)
+            raise Exception("No hay coordenadas disponibles para disparar")
         
-        # Si llegamos aquí, el tablero está lleno (no debería pasar)
-        raise Exception("No hay coordenadas disponibles para disparar")
+        return _coordinate_grid(board_size)[_rng.choice(candidates)]
@@ -1,20 +1,41 @@
 """
 Servicio para gestión de tableros y ABB.
 """
-from typing import List, Tuple
+import base64
+from functools import lru_cache
+from typing import Iterable, List, Tuple
 from app.structures.binary_search_tree import BinarySearchTree
+from app.structures.board_tree import BoardTree
 from app.structures.abb_node import Node
 from app.structures.coordinate_utils import (
     generate_coordinate_codes,
-    balance_array_for_bst,
     coordinate_to_code,
     code_to_coordinate,
     validate_coordinate,
-    get_adjacent_coordinates
+    get_ship_codes
 )
 from app.core.exceptions import CoordinateInvalidError, ShipOutOfBoundsError
 
 
+@lru_cache(maxsize=16)
+def _sorted_coordinates(board_size: int) -> Tuple[Tuple[int, str], ...]:
+    """
+    Pares (código, coordenada) ordenados por código (memoizado).
+    
+    Solo depende del tamaño del tablero, así que se calcula una vez por tamaño.
+    
+    Args:
+        board_size: Tamaño del tablero (NxN)
+    
+    Returns:
+        Tupla de pares (código, coordenada)
+    """
+    return tuple(
+        (code, code_to_coordinate(code, board_size))
+        for code in generate_coordinate_codes(board_size)
+    )
+
+
 class BoardService:
     """Servicio para gestión de tableros usando ABB."""
     
@@ -25,8 +46,14 @@ class BoardService:
         
         Proceso:
         1. Genera todos los códigos de coordenadas (11, 12, ..., NN)
-        2. Reordena usando algoritmo del medio recursivo
-        3. Inserta secuencialmente en el ABB
+        2. Construye el ABB tomando recursivamente el elemento del medio
+           como raíz (misma forma que insertar en el orden de
+           balance_array_for_bst, sin recorrer el árbol en cada inserción)
+        
+        El árbol es un BoardTree: además de los nodos lleva mapas de bytes de
+        disparos y ocupación que usan las consultas de este servicio. Los
+        nodos se crean en el primer acceso a la raíz; una partida que solo
+        dispara y consulta estadísticas nunca los llega a crear.
         
         Args:
             board_size: Tamaño del tablero (NxN)
@@ -34,17 +61,18 @@ class BoardService:
         Returns:
             ABB balanceado con todas las coordenadas
         """
-        # Generar todos los códigos de coordenadas
-        codes = generate_coordinate_codes(board_size)
-        
-        # Reordenar para inserción balanceada
-        balanced_codes = balance_array_for_bst(codes)
-        
-        # Crear el ABB e insertar en orden balanceado
-        bst = BinarySearchTree()
-        for code in balanced_codes:
-            node = Node(id=code, data={"coordinate": code_to_coordinate(code, board_size)})
-            bst.insert(node)
+        # Códigos ordenados (memoizados por tamaño)
+        sorted_coordinates = _sorted_coordinates(board_size)
+        
+        # Crear el ABB directamente desde los nodos ordenados (diferido)
+        bst = BoardTree(board_size)
+        bst.build_from_sorted_lazily(
+            lambda: [
+                Node(id=code, data={"coordinate": coordinate})
+                for code, coordinate in sorted_coordinates
+            ],
+            len(sorted_coordinates)
+        )
         
         return bst
     
@@ -78,6 +106,11 @@ class BoardService:
         Returns:
             True si se marcó exitosamente, False si no existe
         """
+        if isinstance(bst, BoardTree):
+            # Acceso directo a la celda, sin recorrer el árbol
+            bst.mark_shot_index(bst.coordinate_index(coordinate))
+            return True
+        
         code = coordinate_to_code(coordinate, board_size)
         node = bst.search(code)
         
@@ -102,6 +135,9 @@ class BoardService:
         Returns:
             True si ya fue disparada, False en caso contrario
         """
+        if isinstance(bst, BoardTree):
+            return bst.shot_cells[bst.coordinate_index(coordinate)] == 1
+        
         code = coordinate_to_code(coordinate, board_size)
         node = bst.search(code)
         
@@ -110,6 +146,40 @@ class BoardService:
         
         return False
     
+    @staticmethod
+    def try_mark_coordinate_as_shot(bst: BinarySearchTree, coordinate: str, board_size: int = 10) -> bool:
+        """
+        Marca una coordenada como disparada si aún no lo estaba.
+        
+        Equivale a is_coordinate_shot seguido de mark_coordinate_as_shot, pero
+        resuelve la celda (o busca el nodo en un ABB genérico) una sola vez.
+        
+        Args:
+            bst: Árbol binario de búsqueda
+            coordinate: Coordenada a marcar (ej: "A1")
+            board_size: Tamaño del tablero
+        
+        Returns:
+            True si se marcó, False si ya había sido disparada
+        """
+        if isinstance(bst, BoardTree):
+            index = bst.coordinate_index(coordinate)
+            if bst.shot_cells[index]:
+                return False
+            bst.mark_shot_index(index)
+            return True
+        
+        # ABB genérico: una sola búsqueda para consultar y marcar el nodo
+        node = bst.search(coordinate_to_code(coordinate, board_size))
+        if node is None:
+            return True
+        if node.data is None:
+            node.data = {}
+        if node.data.get("is_shot", False):
+            return False
+        node.data["is_shot"] = True
+        return True
+    
     @staticmethod
     def get_board_statistics(bst: BinarySearchTree) -> dict:
         """
@@ -121,6 +191,16 @@ class BoardService:
         Returns:
             Diccionario con estadísticas
         """
+        if isinstance(bst, BoardTree):
+            # Contadores mantenidos al disparar, sin recorrer celdas
+            total_cells = len(bst.shot_cells)
+            shot_cells = bst.shot_count
+            return {
+                "total_cells": total_cells,
+                "shot_cells": shot_cells,
+                "remaining_cells": total_cells - shot_cells
+            }
+        
         all_nodes = bst.inOrder()
         
         total_cells = len(all_nodes)
@@ -176,21 +256,18 @@ class BoardService:
             - start_coordinate válida
             - El barco no se sale del tablero
         """
-        # Validar coordenada inicial
-        is_valid, error_msg = BoardService.validate_coordinate_for_board(
-            start_coordinate, board_size
-        )
-        if not is_valid:
-            return False, [], error_msg
-        
-        # Calcular coordenadas del barco
+        # Calcular las celdas del barco; get_ship_codes ya valida la
+        # coordenada inicial, así que la validación detallada solo se
+        # repite para construir el mensaje de error
         try:
-            coordinates = get_adjacent_coordinates(
-                start_coordinate, board_size, orientation, size
-            )
-            return True, coordinates, ""
+            codes = get_ship_codes(start_coordinate, board_size, orientation, size)
         except ValueError as e:
-            return False, [], str(e)
+            is_valid, error_msg = BoardService.validate_coordinate_for_board(
+                start_coordinate, board_size
+            )
+            return False, [], error_msg if not is_valid else str(e)
+        
+        return True, [code_to_coordinate(code, board_size) for code in codes], ""
     
     @staticmethod
     def check_coordinates_available(
@@ -212,6 +289,13 @@ class BoardService:
             - Buscar en el ABB
             - Si alguna está ocupada, retornar False
         """
+        if isinstance(bst, BoardTree):
+            occupied = bst.occupied_cells
+            for coord in coordinates:
+                if occupied[bst.coordinate_index(coord)]:
+                    return False, f"La coordenada {coord} ya está ocupada"
+            return True, ""
+        
         for coord in coordinates:
             code = coordinate_to_code(coord)
             node = bst.search(code)
@@ -239,8 +323,13 @@ class BoardService:
             - Convertir cada coordenada a código
             - Actualizar en ABB con referencia al barco
         """
+        is_board_tree = isinstance(bst, BoardTree)
         for coord in coordinates:
-            code = coordinate_to_code(coord)
+            if is_board_tree:
+                code = coordinate_to_code(coord, bst.board_size)
+                bst.occupied_cells[bst.cell_index(code)] = 1
+            else:
+                code = coordinate_to_code(coord)
             node = bst.search(code)
             
             if node:
@@ -263,6 +352,12 @@ class BoardService:
             Lista de disparos con formato: [{"coordinate": "A1", "result": "water"}, ...]
         """
         shots = []
+        shot_cells = bst.shot_cells if isinstance(bst, BoardTree) else None
+        
+        def is_shot(node) -> bool:
+            if shot_cells is not None:
+                return shot_cells[bst.cell_index(node.id)] == 1
+            return bool(node.data and node.data.get("is_shot"))
         
         def traverse(node):
             if node is None:
@@ -272,11 +367,11 @@ class BoardService:
             traverse(node.left)
             
             # Si el nodo fue disparado, agregarlo
-            if node.data and node.data.get("is_shot"):
+            if is_shot(node):
                 coordinate = code_to_coordinate(node.id, board_size)
                 
                 # Determinar el resultado del disparo
-                is_occupied = node.data.get("occupied", False)
+                is_occupied = bool(node.data) and node.data.get("occupied", False)
                 
                 if is_occupied:
                     # Hay un barco aquí, verificar si está hundido
@@ -298,3 +393,48 @@ class BoardService:
         
         traverse(bst.root)
         return shots
+    
+    @staticmethod
+    def build_compact_board(
+        board_size: int,
+        ship_codes: Iterable[int],
+        shots: Iterable
+    ) -> dict:
+        """
+        Representa un tablero como tres mapas de bits en base64.
+        
+        La celda de la fila r y columna c (ambas desde 1) ocupa el bit
+        i = (r - 1) * board_size + (c - 1): bit i % 8 del byte i // 8.
+        
+        Args:
+            board_size: Tamaño del tablero
+            ship_codes: Códigos de las celdas con barco (vacío para ocultarlas)
+            shots: Disparos recibidos en el tablero (con coordinate_code y result)
+        
+        Returns:
+            Diccionario con board_size, has_ship_bits, is_shot_bits e is_hit_bits
+        """
+        multiplier = 100 if board_size >= 10 else 10
+        n_bytes = (board_size * board_size + 7) // 8
+        has_ship = bytearray(n_bytes)
+        is_shot = bytearray(n_bytes)
+        is_hit = bytearray(n_bytes)
+        
+        for code in ship_codes:
+            i = (code // multiplier - 1) * board_size + code % multiplier - 1
+            has_ship[i >> 3] |= 1 << (i & 7)
+        
+        for shot in shots:
+            code = shot.coordinate_code
+            i = (code // multiplier - 1) * board_size + code % multiplier - 1
+            bit = 1 << (i & 7)
+            is_shot[i >> 3] |= bit
+            if shot.result != "water":
+                is_hit[i >> 3] |= bit
+        
+        return {
+            "board_size": board_size,
+            "has_ship_bits": base64.b64encode(has_ship).decode("ascii"),
+            "is_shot_bits": base64.b64encode(is_shot).decode("ascii"),
+            "is_hit_bits": base64.b64encode(is_hit).decode("ascii")
+        }
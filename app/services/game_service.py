@@ -1,6 +1,7 @@
 """
 Servicio para gestión de partidas.
 """
+import logging
 from typing import Optional, List
 from datetime import datetime
 
@@ -12,10 +13,18 @@ from app.storage.in_memory_store import (
     get_base_fleet,
     get_ship_template,
     update_game_status,
-    join_game_as_player2
+    join_game_as_player2,
+    get_username,
+    set_game_status
 )
 from app.storage.data_models import ShotData, ShipInstanceData
-from app.structures.coordinate_utils import coordinate_to_code, validate_coordinate
+from app.structures.coordinate_utils import resolve_coordinate
+from app.structures.board_tree import BoardTree
+
+
+# Trazas de depuración de la partida; con el nivel por defecto (INFO) no se
+# formatean los mensajes
+logger = logging.getLogger(__name__)
 
 
 class GameService:
@@ -52,19 +61,22 @@ class GameService:
             board_size=base_fleet.board_size,
             player1_abb_tree=player1_abb_tree,
             player1_fleet_tree=player1_fleet_tree,
-            is_multiplayer=is_multiplayer
+            is_multiplayer=is_multiplayer,
+            ships_to_place=base_fleet.ship_count
         )
+        game.player1_username = get_username(player1_id)
         
         return {
             "game_id": game.id,
             "player1_id": game.player1_id,
+            "player1_username": game.player1_username,
             "player2_id": game.player2_id,
             "current_turn_player_id": game.current_turn_player_id,
             "base_fleet_id": game.base_fleet_id,
             "board_size": game.board_size,
             "status": game.status,
             "is_multiplayer": game.is_multiplayer,
-            "available_ships": len(base_fleet.ship_template_ids),
+            "available_ships": base_fleet.ship_count,
             "ship_template_ids": base_fleet.ship_template_ids
         }
     
@@ -114,17 +126,20 @@ class GameService:
         
         if not updated_game:
             return False, "Error al unirse a la partida", None
+        updated_game.player2_username = get_username(player2_id)
         
         return True, "Te has unido exitosamente a la partida", {
             "game_id": updated_game.id,
             "player1_id": updated_game.player1_id,
+            "player1_username": updated_game.player1_username,
             "player2_id": updated_game.player2_id,
+            "player2_username": updated_game.player2_username,
             "current_turn_player_id": updated_game.current_turn_player_id,
             "base_fleet_id": updated_game.base_fleet_id,
             "board_size": updated_game.board_size,
             "status": updated_game.status,
             "is_multiplayer": updated_game.is_multiplayer,
-            "available_ships": len(base_fleet.ship_template_ids),
+            "available_ships": base_fleet.ship_count,
             "ship_template_ids": base_fleet.ship_template_ids
         }
     
@@ -168,18 +183,20 @@ class GameService:
                 return False, "No se pueden colocar barcos en esta fase del juego", None
             
             # Validar que el jugador no haya terminado ya de colocar todos sus barcos
-            base_fleet = get_base_fleet(game.base_fleet_id)
-            if is_player1 and len(game.player1_ships) >= len(base_fleet.ship_template_ids):
-                return False, "Ya has colocado todos tus barcos", None
-            if is_player2 and len(game.player2_ships) >= len(base_fleet.ship_template_ids):
+            ships_to_place = game.player1_ships_to_place if is_player1 else game.player2_ships_to_place
+            if ships_to_place <= 0:
                 return False, "Ya has colocado todos tus barcos", None
         else:
             # Modo vs IA: solo jugador 1 puede colocar
             if game.status != "setup":
                 return False, "Solo se pueden colocar barcos en fase de configuración", None
         
-        # Validar que la coordenada es válida para el tablero
-        if not validate_coordinate(start_coordinate, game.board_size):
+        # Validar que la coordenada es válida para el tablero (consulta en la
+        # tabla del tablero; el formato solo se analiza si no está en ella).
+        # El código obtenido se reutiliza al validar la colocación
+        try:
+            _, start_code = resolve_coordinate(start_coordinate, game.board_size)
+        except ValueError:
             return False, f"Coordenada {start_coordinate} inválida para tablero {game.board_size}x{game.board_size}", None
         
         # Obtener plantilla del barco
@@ -191,10 +208,12 @@ class GameService:
         if is_player1:
             fleet_tree = game.player1_fleet_tree
             occupied_coords = game.player1_occupied_coordinates
+            segment_index = game.player1_segment_index
             ships_list = game.player1_ships
         else:  # is_player2
             fleet_tree = game.player2_fleet_tree
             occupied_coords = game.player2_occupied_coordinates
+            segment_index = game.player2_segment_index
             ships_list = game.player2_ships
         
         # Validar colocación
@@ -203,66 +222,80 @@ class GameService:
             start_coordinate,
             orientation,
             template.size,
-            occupied_coords
+            occupied_coords,
+            start_code
         )
         
         if not is_valid:
             return False, message, None
         
         # Crear instancia del barco
-        ship_instance = ShipService.create_ship_instance(ship_template_id, coordinates, game.board_size)
+        ship_instance = ShipService.create_ship_instance(
+            ship_template_id, coordinates, game.board_size, template
+        )
         if not ship_instance:
             return False, "Error al crear instancia del barco", None
         
         # Agregar barco al árbol N-ario
-        ShipService.add_ship_to_fleet(fleet_tree, ship_instance)
+        ship_node = ShipService.add_ship_to_fleet(fleet_tree, ship_instance)
+        ShipService.index_ship_segments(segment_index, ship_instance, ship_node)
         
-        # Marcar coordenadas como ocupadas
-        for coord in coordinates:
-            code = coordinate_to_code(coord, game.board_size)
-            occupied_coords[code] = ship_template_id
+        # Marcar coordenadas como ocupadas (los segmentos ya traen el código)
+        occupied_coords.update(dict.fromkeys(
+            [segment.coordinate_code for segment in ship_instance.segments],
+            ship_template_id
+        ))
         
         # Agregar a la lista de barcos del juego
         ships_list.append(ship_instance)
+        if is_player1:
+            game.player1_ships_to_place -= 1
+            game.player1_ships_afloat += 1
+        else:
+            game.player2_ships_to_place -= 1
+            game.player2_ships_afloat += 1
         
         # Verificar si todos los barcos fueron colocados y actualizar estado
-        base_fleet = get_base_fleet(game.base_fleet_id)
-        
         if game.is_multiplayer:
             # Modo multijugador: verificar si ambos jugadores terminaron de colocar barcos
-            player1_ready = len(game.player1_ships) >= len(base_fleet.ship_template_ids)
-            player2_ready = game.player2_id and len(game.player2_ships) >= len(base_fleet.ship_template_ids)
+            player1_ready = game.player1_ships_to_place <= 0
+            player2_ready = game.player2_id and game.player2_ships_to_place <= 0
             
             # Si ambos jugadores terminaron, iniciar el juego
             if player1_ready and player2_ready:
-                game.status = "player1_turn"
+                set_game_status(game, "player1_turn")
                 game.current_turn_player_id = game.player1_id
         else:
             # Modo vs IA: inicializar IA cuando jugador 1 termine
-            if len(game.player1_ships) == len(base_fleet.ship_template_ids):
+            if game.player1_ships_to_place == 0:
                 from app.services.ai_service import AIService
                 from app.structures.n_ary_tree import NaryTree
                 
+                base_fleet = get_base_fleet(game.base_fleet_id)
+                
                 # Crear tablero de la IA (player2)
                 game.player2_abb_tree = BoardService.create_balanced_bst(game.board_size)
                 game.player2_fleet_tree = NaryTree({"type": "fleet", "player": "ai"})
                 
-                # Obtener plantillas de barcos
+                # Obtener plantillas de barcos (una consulta por plantilla;
+                # se reutilizan al crear las instancias)
+                templates_by_id = {}
                 ship_templates = []
                 for ship_template_id in base_fleet.ship_template_ids:
                     template = get_ship_template(ship_template_id)
                     if template:
+                        templates_by_id[ship_template_id] = template
                         ship_templates.append({
                             "id": ship_template_id,
                             "size": template.size,
                             "name": template.name
                         })
                 
-                # Colocar barcos de la IA aleatoriamente
+                # Colocar barcos de la IA aleatoriamente (tablero vacío; las
+                # colisiones las resuelve el mapa de celdas de la IA)
                 ai_placements = AIService.place_ships_randomly(
                     ship_templates,
-                    game.board_size,
-                    set()
+                    game.board_size
                 )
                 
                 # Crear instancias de barcos de la IA
@@ -270,18 +303,24 @@ class GameService:
                     ai_ship = ShipService.create_ship_instance(
                         placement["template_id"],
                         placement["coordinates"],
-                        game.board_size
+                        game.board_size,
+                        templates_by_id[placement["template_id"]]
                     )
                     if ai_ship:
                         game.player2_ships.append(ai_ship)
-                        ShipService.add_ship_to_fleet(game.player2_fleet_tree, ai_ship)
+                        game.player2_ships_afloat += 1
+                        ai_ship_node = ShipService.add_ship_to_fleet(game.player2_fleet_tree, ai_ship)
+                        ShipService.index_ship_segments(
+                            game.player2_segment_index, ai_ship, ai_ship_node
+                        )
                         
                         # Marcar coordenadas como ocupadas
-                        for coord in placement["coordinates"]:
-                            code = coordinate_to_code(coord, game.board_size)
-                            game.player2_occupied_coordinates[code] = placement["template_id"]
+                        game.player2_occupied_coordinates.update(dict.fromkeys(
+                            [segment.coordinate_code for segment in ai_ship.segments],
+                            placement["template_id"]
+                        ))
                 
-                game.status = "in_progress"
+                set_game_status(game, "in_progress")
                 game.current_turn_player_id = game.player1_id
         
         return True, "Barco colocado exitosamente", ship_instance
@@ -347,9 +386,6 @@ class GameService:
             # Determinar quién dispara y a quién
             is_player1 = (player_id == game.player1_id)
             target_abb_tree = game.player2_abb_tree if is_player1 else game.player1_abb_tree
-            target_fleet_tree = game.player2_fleet_tree if is_player1 else game.player1_fleet_tree
-            target_ships = game.player2_ships if is_player1 else game.player1_ships
-            shooter_shots = game.player1_shots if is_player1 else game.player2_shots
             
         else:
             # Modo vs IA: usa player2_* para la IA
@@ -358,88 +394,31 @@ class GameService:
                 return False, "El juego no está correctamente inicializado. Coloca todos tus barcos primero.", None
             
             target_abb_tree = game.player2_abb_tree
-            target_fleet_tree = game.player2_fleet_tree
-            target_ships = game.player2_ships
-            shooter_shots = game.player1_shots
+            is_player1 = True  # En vs IA siempre dispara el jugador 1
         
-        # Validar coordenada
-        if not validate_coordinate(coordinate, game.board_size):
+        # Validar coordenada y obtener su código en una sola consulta
+        try:
+            coordinate, coordinate_code = resolve_coordinate(coordinate, game.board_size)
+        except ValueError:
             return False, f"Coordenada {coordinate} inválida", None
         
-        coordinate_code = coordinate_to_code(coordinate, game.board_size)
-        
-        # Verificar si ya fue disparada
-        if BoardService.is_coordinate_shot(target_abb_tree, coordinate, game.board_size):
+        # Marcar como disparada en el ABB del objetivo (falla si ya lo estaba)
+        if not BoardService.try_mark_coordinate_as_shot(target_abb_tree, coordinate, game.board_size):
             return False, "Esta coordenada ya fue disparada", None
         
-        # Marcar como disparada en el ABB del objetivo
-        BoardService.mark_coordinate_as_shot(target_abb_tree, coordinate, game.board_size)
-        
-        # Verificar si hay un barco en esa coordenada
-        ship_node = ShipService.find_ship_by_coordinate(target_fleet_tree, coordinate_code)
-        
-        result = "water"
-        ship_hit_name = None
-        ship_sunk = False
-        game_finished = False
-        
-        if ship_node:
-            # Impacto en barco
-            segment_found, is_sunk = ShipService.hit_ship_segment(
-                target_fleet_tree,
-                ship_node,
-                coordinate_code
-            )
-            
-            if segment_found:
-                result = "sunk" if is_sunk else "hit"
-                ship_hit_name = ship_node.data.get("ship_name")
-                ship_sunk = is_sunk
-                
-                # Actualizar estado del barco en la lista
-                # Buscar el barco por coordenada en lugar de solo por template_id
-                # para manejar correctamente múltiples barcos del mismo tipo
-                for ship in target_ships:
-                    # Verificar si este barco contiene la coordenada impactada
-                    ship_has_coordinate = any(seg.coordinate_code == coordinate_code for seg in ship.segments)
-                    if ship_has_coordinate:
-                        # Marcar segmento como impactado
-                        for segment in ship.segments:
-                            if segment.coordinate_code == coordinate_code:
-                                segment.is_hit = True
-                        
-                        # Verificar si todos los segmentos están impactados
-                        all_segments_hit = all(seg.is_hit for seg in ship.segments)
-                        
-                        # Si todos los segmentos están impactados, el barco está hundido
-                        if all_segments_hit:
-                            ship.is_sunk = True
-                            print(f"🔴 DEBUG: Barco {ship.ship_name} marcado como hundido. is_sunk={ship.is_sunk}")
-                            print(f"🔴 DEBUG: target_ships es player1_ships={target_ships is game.player1_ships}, player2_ships={target_ships is game.player2_ships}")
-                            print(f"🔴 DEBUG: ID del barco en memoria: {id(ship)}")
-                        break
-                
-                # Verificar si todos los barcos fueron hundidos
-                fleet_status = ShipService.get_fleet_status(target_fleet_tree)
-                if fleet_status["all_ships_sunk"]:
-                    if game.is_multiplayer:
-                        # Determinar ganador
-                        game.status = "player1_won" if is_player1 else "player2_won"
-                        game.winner = game.player1_id if is_player1 else game.player2_id
-                    else:
-                        game.status = "finished"
-                        game.winner = "player"
-                    game.finished_at = datetime.now()
-                    game_finished = True
-        
-        # Registrar disparo
-        shot = ShotData(
-            coordinate=coordinate,
-            coordinate_code=coordinate_code,
-            result=result,
-            timestamp=datetime.now()
+        # Resolver el impacto sobre la flota rival y registrar el disparo
+        result, ship_hit_name, game_finished = GameService._apply_shot(
+            game, is_player1, coordinate, coordinate_code
         )
-        shooter_shots.append(shot)
+        
+        if game_finished:
+            if game.is_multiplayer:
+                # Determinar ganador
+                set_game_status(game, "player1_won" if is_player1 else "player2_won")
+                game.winner = game.player1_id if is_player1 else game.player2_id
+            else:
+                set_game_status(game, "finished")
+                game.winner = "player"
         
         # Cambiar turno
         ai_shot_result = None
@@ -447,29 +426,89 @@ class GameService:
             if game.is_multiplayer:
                 # Cambiar turno al otro jugador
                 if is_player1:
-                    game.status = "player2_turn"
+                    set_game_status(game, "player2_turn")
                     game.current_turn_player_id = game.player2_id
                 else:
-                    game.status = "player1_turn"
+                    set_game_status(game, "player1_turn")
                     game.current_turn_player_id = game.player1_id
             else:
-                # Modo vs IA
-                game.current_turn = "ai"
+                # Modo vs IA: la IA responde inmediatamente
                 ai_shot_result = GameService._ai_turn(game)
-                game.current_turn = "player"
         
         shot_result = {
             "coordinate": coordinate,
             "coordinate_code": coordinate_code,
             "result": result,
             "ship_hit": ship_hit_name,
-            "ship_sunk": ship_sunk,
+            "ship_sunk": result == "sunk",
             "game_won": game_finished,
             "ai_shot": ai_shot_result  # Solo para vs IA
         }
         
         return True, "Disparo realizado", shot_result
     
+    @staticmethod
+    def _apply_shot(
+        game: 'Game',
+        is_player1: bool,
+        coordinate: str,
+        coordinate_code: int
+    ) -> tuple[str, Optional[str], bool]:
+        """
+        Resuelve un disparo ya marcado en el tablero del objetivo.
+        
+        Común a los disparos de los jugadores y de la IA: aplica el impacto
+        sobre la flota rival y registra el disparo. Si hunde el último barco
+        fija game.finished_at; el estado y el ganador los decide el llamador.
+        
+        Args:
+            game: Instancia del juego
+            is_player1: True si dispara el jugador 1, False si el jugador 2/IA
+            coordinate: Coordenada disparada
+            coordinate_code: Código de la coordenada
+        
+        Returns:
+            Tupla (resultado, nombre_barco_impactado, flota_rival_hundida)
+        """
+        # Verificar si hay un barco rival en esa coordenada: el índice de
+        # segmentos resuelve barco y segmento en una sola consulta
+        if is_player1:
+            entry = game.player2_segment_index.get(coordinate_code)
+            fleet_tree = game.player2_fleet_tree
+        else:
+            entry = game.player1_segment_index.get(coordinate_code)
+            fleet_tree = game.player1_fleet_tree
+        
+        result = "water"
+        ship_hit_name = None
+        fleet_sunk = False
+        
+        if entry is not None:
+            # Impacto en barco (actualiza el barco y su nodo del árbol N-ario)
+            ship, is_sunk = ShipService.hit_indexed_segment(fleet_tree, entry)
+            result = "sunk" if is_sunk else "hit"
+            ship_hit_name = ship.ship_name
+            if is_sunk:
+                logger.debug(
+                    "Barco hundido en la partida %s: %s (template_id: %s)",
+                    game.id, ship.ship_name, ship.ship_template_id
+                )
+            
+            # Verificar si todos los barcos fueron hundidos (contador de
+            # barcos a flote del objetivo, sin recorrer la flota)
+            if is_sunk and game.sink_ship(not is_player1) == 0:
+                game.finished_at = datetime.now()
+                fleet_sunk = True
+        
+        # Registrar disparo
+        game.record_shot(is_player1, ShotData(
+            coordinate=coordinate,
+            coordinate_code=coordinate_code,
+            result=result
+        ))
+        
+        return result, ship_hit_name, fleet_sunk
+    
     @staticmethod
     def _ai_turn(game: 'Game') -> Optional[dict]:
         """
@@ -483,76 +522,56 @@ class GameService:
         """
         from app.services.ai_service import AIService
         
+        # Celdas ya disparadas por la IA: el mapa del ABB del jugador
+        target_tree = game.player1_abb_tree
+        if isinstance(target_tree, BoardTree):
+            shot_cells = target_tree.shot_cells
+        else:
+            shot_cells = bytearray(game.board_size * game.board_size)
+            multiplier = 100 if game.board_size >= 10 else 10
+            for shot in game.player2_shots:
+                row, col = divmod(shot.coordinate_code, multiplier)
+                shot_cells[(row - 1) * game.board_size + col - 1] = 1
+        
         # Obtener siguiente coordenada a disparar
         ai_coordinate = AIService.get_next_shot(
             game.board_size,
-            [{"coordinate": s.coordinate, "result": s.result} for s in game.player2_shots],
+            shot_cells,
             game.player2_last_hits,
             game.difficulty
         )
         
-        coordinate_code = coordinate_to_code(ai_coordinate, game.board_size)
+        ai_coordinate, coordinate_code = resolve_coordinate(ai_coordinate, game.board_size)
         
-        # Marcar como disparada en el ABB del jugador
-        BoardService.mark_coordinate_as_shot(game.player1_abb_tree, ai_coordinate, game.board_size)
-        
-        # Verificar si hay un barco del jugador en esa coordenada
-        ship_node = ShipService.find_ship_by_coordinate(game.player1_fleet_tree, coordinate_code)
+        # Marcar como disparada en el mapa de celdas del jugador (con el
+        # código ya resuelto, sin volver a buscar la coordenada)
+        if isinstance(target_tree, BoardTree):
+            target_tree.mark_shot(coordinate_code)
+        else:
+            BoardService.mark_coordinate_as_shot(target_tree, ai_coordinate, game.board_size)
         
-        result = "water"
-        ship_hit_name = None
-        ship_sunk = False
-        
-        if ship_node:
-            # Impacto en barco del jugador
-            segment_found, is_sunk = ShipService.hit_ship_segment(
-                game.player1_fleet_tree,
-                ship_node,
-                coordinate_code
-            )
-            
-            if segment_found:
-                result = "sunk" if is_sunk else "hit"
-                ship_hit_name = ship_node.data.get("ship_name")
-                ship_sunk = is_sunk
-                
-                # Actualizar estado del barco del jugador
-                for ship in game.player1_ships:
-                    if ship.ship_template_id == ship_node.data.get("ship_template_id"):
-                        for segment in ship.segments:
-                            if segment.coordinate_code == coordinate_code:
-                                segment.is_hit = True
-                        if is_sunk:
-                            ship.is_sunk = True
-                            # Remover de last_hits si se hundió
-                            game.player2_last_hits = []
-                        break
-                
-                # Si fue impacto pero no hundido, agregar a last_hits
-                if result == "hit":
-                    game.player2_last_hits.append(ai_coordinate)
-                
-                # Verificar si todos los barcos del jugador fueron hundidos
-                fleet_status = ShipService.get_fleet_status(game.player1_fleet_tree)
-                if fleet_status["all_ships_sunk"]:
-                    game.status = "finished"
-                    game.winner = "ai"
-                    game.finished_at = datetime.now()
-        
-        # Registrar disparo de la IA
-        ai_shot = ShotData(
-            coordinate=ai_coordinate,
-            coordinate_code=coordinate_code,
-            result=result,
-            timestamp=datetime.now()
+        # Resolver el impacto sobre la flota del jugador y registrar el disparo
+        result, ship_hit_name, fleet_sunk = GameService._apply_shot(
+            game, False, ai_coordinate, coordinate_code
         )
-        game.player2_shots.append(ai_shot)
+        
+        if result == "sunk":
+            # Barco hundido: la IA deja de cazar alrededor de sus impactos
+            game.player2_last_hits.clear()
+        elif result == "hit":
+            # Impacto sin hundir: la IA seguirá cazando alrededor
+            game.player2_last_hits.append(ai_coordinate)
+        
+        # Todos los barcos del jugador hundidos
+        if fleet_sunk:
+            set_game_status(game, "finished")
+            game.winner = "ai"
         
         return {
             "coordinate": ai_coordinate,
             "result": result,
             "ship_hit": ship_hit_name,
-            "ship_sunk": ship_sunk
+            "ship_sunk": result == "sunk"
         }
     
     @staticmethod
@@ -583,24 +602,15 @@ class GameService:
             fleet_tree = game.player1_fleet_tree if is_player1 else game.player2_fleet_tree
             ships_list = ShipService.get_ships_list(fleet_tree)
             
-            # Obtener disparos del jugador
-            shots = game.player1_shots if is_player1 else game.player2_shots
         else:
             # Modo vs IA: mostrar barcos del jugador (player1)
             stats = game.get_stats()
             ships_list = ShipService.get_ships_list(game.player1_fleet_tree) if game.player1_fleet_tree else []
-            shots = game.player1_shots
-        
-        # Convertir disparos a formato de respuesta
-        shot_history = [
-            {
-                "coordinate": shot.coordinate,
-                "coordinate_code": shot.coordinate_code,
-                "result": shot.result,
-                "timestamp": shot.timestamp.isoformat()
-            }
-            for shot in shots
-        ]
+            is_player1 = True
+        
+        # Disparos del jugador ya serializados (la hora se formatea al leer
+        # el historial, una vez por disparo)
+        shot_history = game.get_shot_dicts(is_player1)
         
         return {
             "game": {
@@ -619,7 +629,7 @@ class GameService:
                 "ships_remaining": stats["ships_remaining"],
                 "ships_sunk": stats["ships_sunk"],
                 "enemy_ships_sunk": stats["enemy_ships_sunk"],
-                "created_at": game.created_at.isoformat(),
+                "created_at": game.created_at_iso,
                 "finished_at": game.finished_at.isoformat() if game.finished_at else None
             },
             "ships": ships_list,
@@ -638,12 +648,13 @@ class GameService:
             True si todos los barcos están hundidos
         
         Proceso:
-            - Recorrer todos los barcos en el árbol
-            - Para cada barco, verificar si todos sus segmentos is_hit=True
-            - Si algún barco tiene segmentos intactos, retornar False
+            - Recorrer los barcos del árbol (hijos de la raíz)
+            - Cada impacto mantiene is_sunk en el nodo del barco, así que no
+              hace falta recorrer sus segmentos
+            - Al primer barco a flote se retorna False
         """
-        fleet_status = ShipService.get_fleet_status(fleet_tree)
-        return fleet_status["all_ships_sunk"]
+        ships = fleet_tree.get_children(fleet_tree.root)
+        return all(ship.data.get("is_sunk", False) for ship in ships)
     
     @staticmethod
     def validate_shot(game, coordinate: str) -> tuple[bool, str]:
@@ -700,7 +711,7 @@ class GameService:
             Flota: [5, 5, 5, 5, 5] = 25 celdas ❌
         """
         total_cells = board_size * board_size
-        max_allowed = int(total_cells * 0.20)
+        max_allowed = total_cells // 5  # 20%, en aritmética entera
         total_ship_cells = sum(ship_sizes)
         
         if total_ship_cells > max_allowed:
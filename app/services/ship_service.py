@@ -4,16 +4,50 @@ Servicio para gestión de barcos y árbol N-ario de flota.
 from typing import List, Optional, Dict
 from app.structures.n_ary_tree import NaryTree, TreeNode
 from app.structures.coordinate_utils import (
-    get_adjacent_coordinates,
+    get_ship_codes,
     coordinates_overlap,
-    coordinate_to_code
+    code_to_coordinate,
+    resolve_coordinate
 )
-from app.storage.data_models import ShipInstanceData, ShipSegmentData
+from app.storage.data_models import ShipInstanceData, ShipSegmentData, ShipTemplate
 from app.storage.in_memory_store import get_ship_template
 
 
+def _find_segment(segments: List[TreeNode], coordinate_code: int) -> Optional[TreeNode]:
+    """
+    Busca el segmento de un barco por su código, por desplazamiento.
+    
+    Los segmentos de un barco son celdas consecutivas en línea recta, así que
+    sus códigos forman una progresión (paso 1 en horizontal, el multiplicador
+    en vertical): el índice del segmento se calcula sin recorrer la lista.
+    
+    Args:
+        segments: Nodos de segmento del barco, en orden
+        coordinate_code: Código de la coordenada buscada
+    
+    Returns:
+        Nodo del segmento o None si no pertenece al barco
+    """
+    if not segments:
+        return None
+    start = segments[0].data.get("coordinate_code")
+    step = segments[1].data.get("coordinate_code") - start if len(segments) > 1 else 1
+    offset, remainder = divmod(coordinate_code - start, step)
+    if remainder or not 0 <= offset < len(segments):
+        return None
+    segment = segments[offset]
+    return segment if segment.data.get("coordinate_code") == coordinate_code else None
+
+
 class ShipService:
-    """Servicio para gestión de barcos usando árbol N-ario."""
+    """
+    Servicio para gestión de barcos usando árbol N-ario.
+    
+    El árbol (jugador → barcos → segmentos) es la estructura de la flota y la
+    que se recorre para listarla. Los disparos no lo recorren: cada partida
+    guarda un índice plano código -> (barco, nodo, segmento) que se llena al
+    colocar (index_ship_segments) y se consulta en O(1) (hit_indexed_segment).
+    """
     
     @staticmethod
     def create_fleet_tree(player_id: str) -> NaryTree:
@@ -79,7 +113,8 @@ class ShipService:
         start_coordinate: str,
         orientation: str,
         ship_size: int,
-        occupied_coordinates: Dict[int, str]
+        occupied_coordinates: Dict[int, str],
+        start_code: Optional[int] = None
     ) -> tuple[bool, str, List[str]]:
         """
         Valida si un barco puede ser colocado en una posición.
@@ -90,31 +125,35 @@ class ShipService:
             orientation: "horizontal" o "vertical"
             ship_size: Tamaño del barco
             occupied_coordinates: Diccionario de coordenadas ocupadas
+            start_code: Código de start_coordinate si el llamador ya lo
+                resolvió (opcional)
         
         Returns:
             Tupla (es_válido, mensaje, coordenadas)
         """
         try:
-            # Obtener coordenadas que ocuparía el barco
-            ship_coordinates = get_adjacent_coordinates(
-                start_coordinate, board_size, orientation, ship_size
+            # Obtener los códigos de las celdas que ocuparía el barco
+            ship_codes = get_ship_codes(
+                start_coordinate, board_size, orientation, ship_size, start_code
             )
         except ValueError as e:
             return False, str(e), []
         
-        # Verificar si alguna coordenada ya está ocupada
-        for coord in ship_coordinates:
-            code = coordinate_to_code(coord, board_size)
-            if code in occupied_coordinates:
-                return False, f"La coordenada {coord} ya está ocupada", []
+        # Verificar si alguna coordenada ya está ocupada: una sola llamada
+        # sobre las claves; la celda en conflicto solo se busca si la hay
+        if not occupied_coordinates.keys().isdisjoint(ship_codes):
+            code = next(code for code in ship_codes if code in occupied_coordinates)
+            coord = code_to_coordinate(code, board_size)
+            return False, f"La coordenada {coord} ya está ocupada", []
         
-        return True, "Posición válida", ship_coordinates
+        return True, "Posición válida", [code_to_coordinate(code, board_size) for code in ship_codes]
     
     @staticmethod
     def create_ship_instance(
         ship_template_id: str,
         coordinates: List[str],
-        board_size: int = 10
+        board_size: int = 10,
+        template: Optional[ShipTemplate] = None
     ) -> Optional[ShipInstanceData]:
         """
         Crea una instancia de barco con sus segmentos.
@@ -123,22 +162,26 @@ class ShipService:
             ship_template_id: ID de la plantilla de barco
             coordinates: Lista de coordenadas del barco
             board_size: Tamaño del tablero (para codificar coordenadas)
+            template: Plantilla ya obtenida por el llamador (opcional; si no
+                se indica se busca por ship_template_id)
         
         Returns:
             Instancia de barco o None si la plantilla no existe
         """
-        template = get_ship_template(ship_template_id)
+        if template is None:
+            template = get_ship_template(ship_template_id)
         if not template:
             return None
         
-        segments = []
-        for coord in coordinates:
-            segment = ShipSegmentData(
-                coordinate=coord,
-                coordinate_code=coordinate_to_code(coord, board_size),
-                is_hit=False
+        # Los segmentos comparten la cadena de coordenada de la tabla del
+        # tablero en lugar de guardar una copia propia cada uno; se crean en
+        # una sola comprensión (un barco tiene como mucho board_size celdas)
+        segments = [
+            ShipSegmentData(coordinate=coordinate, coordinate_code=code, is_hit=False)
+            for coordinate, code in (
+                resolve_coordinate(coord, board_size) for coord in coordinates
             )
-            segments.append(segment)
+        ]
         
         return ShipInstanceData(
             ship_template_id=ship_template_id,
@@ -148,6 +191,56 @@ class ShipService:
             is_sunk=False
         )
     
+    @staticmethod
+    def index_ship_segments(
+        segment_index: Dict[int, tuple],
+        ship_data: ShipInstanceData,
+        ship_node: TreeNode
+    ) -> None:
+        """
+        Registra los segmentos de un barco en el índice código -> segmento.
+        
+        Args:
+            segment_index: Índice de la flota (código -> (barco, nodo, índice))
+            ship_data: Barco colocado
+            ship_node: Nodo del barco en el árbol N-ario (sus hijos son los
+                segmentos en el mismo orden)
+        """
+        for i, segment in enumerate(ship_data.segments):
+            segment_index[segment.coordinate_code] = (ship_data, ship_node, i)
+    
+    @staticmethod
+    def hit_indexed_segment(
+        fleet_tree: NaryTree,
+        entry: tuple
+    ) -> tuple[ShipInstanceData, bool]:
+        """
+        Marca como impactado el segmento de una entrada del índice.
+        
+        Actualiza tanto el barco como su nodo en el árbol N-ario sin recorrer
+        la flota.
+        
+        Args:
+            fleet_tree: Árbol N-ario de la flota
+            entry: Entrada (barco, nodo del barco, índice del segmento)
+        
+        Returns:
+            Tupla (barco, barco_hundido)
+        """
+        ship, ship_node, index = entry
+        segment = ship.segments[index]
+        if not segment.is_hit:
+            segment.is_hit = True
+            ship.remaining_segments -= 1
+        fleet_tree.get_children(ship_node)[index].data["is_hit"] = True
+        
+        is_sunk = ship.remaining_segments == 0
+        if is_sunk:
+            ship.is_sunk = True
+            ship_node.data["is_sunk"] = True
+        
+        return ship, is_sunk
+    
     @staticmethod
     def find_ship_by_coordinate(
         fleet_tree: NaryTree,
@@ -163,16 +256,13 @@ class ShipService:
         Returns:
             Nodo del barco o None si no se encuentra
         """
-        # Recorrer todos los barcos (hijos de la raíz)
+        # Recorrer todos los barcos (hijos de la raíz); dentro de cada barco
+        # el segmento se localiza por desplazamiento
         ships = fleet_tree.get_children(fleet_tree.root)
         
         for ship_node in ships:
-            # Recorrer segmentos del barco
-            segments = fleet_tree.get_children(ship_node)
-            
-            for segment_node in segments:
-                if segment_node.data.get("coordinate_code") == coordinate_code:
-                    return ship_node
+            if _find_segment(fleet_tree.get_children(ship_node), coordinate_code):
+                return ship_node
         
         return None
     
@@ -193,18 +283,14 @@ class ShipService:
         Returns:
             Tupla (segmento_encontrado, barco_hundido)
         """
-        segments = fleet_tree.get_children(ship_node)
-        segment_found = False
+        # Los hijos se leen del nodo: mark_segment_as_hit llama sin árbol
+        segments = ship_node.children
         
         # Marcar el segmento como impactado
-        for segment_node in segments:
-            if segment_node.data.get("coordinate_code") == coordinate_code:
-                segment_node.data["is_hit"] = True
-                segment_found = True
-                break
-        
-        if not segment_found:
+        segment_node = _find_segment(segments, coordinate_code)
+        if segment_node is None:
             return False, False
+        segment_node.data["is_hit"] = True
         
         # Verificar si todos los segmentos están impactados (barco hundido)
         all_hit = all(seg.data.get("is_hit", False) for seg in segments)
@@ -333,13 +419,7 @@ class ShipService:
             return False, None
         
         # Encontrar el segmento específico
-        segments = fleet_tree.get_children(ship_node)
-        segment_node = None
-        
-        for seg in segments:
-            if seg.data.get("coordinate_code") == coordinate_code:
-                segment_node = seg
-                break
+        segment_node = _find_segment(fleet_tree.get_children(ship_node), coordinate_code)
         
         if segment_node is None:
             return False, None
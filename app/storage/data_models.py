@@ -2,12 +2,13 @@
 Clases Python para almacenamiento de datos en memoria.
 """
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+import time
 import uuid
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """Clase para almacenar datos de usuario."""
     id: str
@@ -17,7 +18,7 @@ class User:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipTemplate:
     """Clase para almacenar plantillas de barcos."""
     id: str
@@ -28,7 +29,7 @@ class ShipTemplate:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseFleet:
     """Clase para almacenar flotas base."""
     id: str
@@ -37,9 +38,14 @@ class BaseFleet:
     ship_template_ids: List[str]
     created_by: str
     created_at: datetime = field(default_factory=datetime.now)
+    # Número de barcos; se recalcula al cambiar ship_template_ids
+    ship_count: int = field(init=False, default=0)
+    
+    def __post_init__(self):
+        self.ship_count = len(self.ship_template_ids)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipSegmentData:
     """Clase para almacenar datos de un segmento de barco."""
     coordinate: str
@@ -47,7 +53,7 @@ class ShipSegmentData:
     is_hit: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipInstanceData:
     """Clase para almacenar instancia de barco en el juego."""
     ship_template_id: str
@@ -55,18 +61,38 @@ class ShipInstanceData:
     size: int
     segments: List[ShipSegmentData]
     is_sunk: bool = False
+    # Segmentos sin impactar; se descuenta al marcar cada impacto
+    remaining_segments: int = field(init=False, default=0)
+    
+    def __post_init__(self):
+        self.remaining_segments = sum(not segment.is_hit for segment in self.segments)
+
 
+# Codificación compacta del resultado de un disparo (un byte por disparo)
+SHOT_RESULT_CODES: Dict[str, int] = {"water": 0, "hit": 1, "sunk": 2}
 
-@dataclass
+
+@dataclass(slots=True)
 class ShotData:
     """Clase para almacenar datos de un disparo."""
     coordinate: str
     coordinate_code: int
     result: str  # "water", "hit", "sunk"
-    timestamp: datetime = field(default_factory=datetime.now)
+    created_at_unix: float = field(default_factory=time.time)  # Hora del disparo (epoch)
+    monotonic_seq: int = field(init=False, default=0)  # Orden del disparo en la partida
+
 
+def _shot_to_dict(shot: ShotData) -> dict:
+    """Serializa un disparo al formato usado por la API (hora en ISO)."""
+    return {
+        "coordinate": shot.coordinate,
+        "coordinate_code": shot.coordinate_code,
+        "result": shot.result,
+        "timestamp": datetime.fromtimestamp(shot.created_at_unix).isoformat()
+    }
 
-@dataclass
+
+@dataclass(slots=True)
 class Game:
     """Clase para almacenar datos de una partida."""
     id: str
@@ -77,95 +103,177 @@ class Game:
     is_multiplayer: bool = False  # True para 2 jugadores, False para vs IA
     
     # Jugador 1
+    player1_username: Optional[str] = None  # Guardado al crear la partida (no cambia)
     player1_abb_tree: Any = None  # ABB de coordenadas del jugador 1
     player1_fleet_tree: Any = None  # Árbol N-ario de flota del jugador 1
     player1_ships: List[ShipInstanceData] = field(default_factory=list)  # Barcos del jugador 1
     player1_shots: List[ShotData] = field(default_factory=list)  # Disparos del jugador 1
-    player1_occupied_coordinates: Dict[int, str] = field(default_factory=dict)  # code -> ship_id
+    player1_occupied_coordinates: Dict[int, str] = field(default_factory=dict)  # code -> ship_template_id (colisiones con keys().isdisjoint)
+    player1_segment_index: Dict[int, tuple] = field(default_factory=dict)  # code -> (barco, nodo, segmento); por celda y no por plantilla, que puede repetirse en la flota
+    player1_shot_dicts: Tuple[dict, ...] = ()  # Disparos ya serializados (se amplía al leer)
+    player1_shot_results: bytearray = field(default_factory=bytearray)  # Resultado codificado por disparo
+    player1_ships_to_place: int = 0  # Barcos pendientes de colocar
+    player1_ships_afloat: int = 0  # Barcos colocados sin hundir
+    player1_misses: int = 0  # Disparos al agua (contador incremental)
     
     # Jugador 2 / IA
     player2_id: Optional[str] = None  # ID del jugador 2 (None si es IA)
+    player2_username: Optional[str] = None  # Guardado al unirse
     player2_abb_tree: Any = None  # ABB de coordenadas del jugador 2/IA
     player2_fleet_tree: Any = None  # Árbol N-ario de flota del jugador 2/IA
     player2_ships: List[ShipInstanceData] = field(default_factory=list)  # Barcos del jugador 2/IA
     player2_shots: List[ShotData] = field(default_factory=list)  # Disparos del jugador 2/IA
     player2_occupied_coordinates: Dict[int, str] = field(default_factory=dict)
+    player2_segment_index: Dict[int, tuple] = field(default_factory=dict)
+    player2_shot_dicts: Tuple[dict, ...] = ()
+    player2_shot_results: bytearray = field(default_factory=bytearray)
+    player2_ships_to_place: int = 0
+    player2_ships_afloat: int = 0
+    player2_misses: int = 0
     player2_last_hits: List[str] = field(default_factory=list)  # Impactos recientes (para IA)
     
+    # Secuencia del próximo disparo (común a ambos jugadores)
+    next_shot_seq: int = 0
+    
     # Control de turnos
     current_turn_player_id: Optional[str] = None  # ID del jugador actual
     difficulty: str = "medium"  # "easy", "medium", "hard" (solo para IA)
     
     created_at: datetime = field(default_factory=datetime.now)
+    created_at_iso: str = field(init=False, repr=False)  # created_at formateado una sola vez
     finished_at: Optional[datetime] = None
     winner: Optional[str] = None  # ID del jugador ganador, o None
     
+    def __post_init__(self):
+        # La fecha de creación no cambia; los listados y detalles que se
+        # consultan en bucle reutilizan la cadena en lugar de formatearla
+        self.created_at_iso = self.created_at.isoformat()
+    
+    def has_player(self, player_id: str) -> bool:
+        """
+        Indica si un usuario participa en la partida.
+        
+        En vs IA player2_id es None, por lo que solo se compara con player1_id.
+        """
+        return player_id == self.player1_id or (
+            self.player2_id is not None and player_id == self.player2_id
+        )
+    
+    def record_shot(self, is_player1: bool, shot: ShotData) -> None:
+        """
+        Registra un disparo, le asigna su secuencia y actualiza los contadores.
+        
+        Es el único punto que escribe el historial de disparos y sus
+        contadores. La hora no se formatea aquí sino en get_shot_dicts.
+        
+        Args:
+            is_player1: True si dispara el jugador 1, False si el jugador 2/IA
+            shot: Disparo realizado
+        """
+        shot.monotonic_seq = self.next_shot_seq
+        self.next_shot_seq += 1
+        if is_player1:
+            self.player1_shots.append(shot)
+            self.player1_shot_results.append(SHOT_RESULT_CODES[shot.result])
+            self.player1_misses += shot.result == "water"
+        else:
+            self.player2_shots.append(shot)
+            self.player2_shot_results.append(SHOT_RESULT_CODES[shot.result])
+            self.player2_misses += shot.result == "water"
+    
+    def sink_ship(self, is_player1: bool) -> int:
+        """
+        Descuenta un barco hundido de la flota de un jugador.
+        
+        Args:
+            is_player1: True si el barco hundido es del jugador 1
+        
+        Returns:
+            Barcos de esa flota que siguen a flote
+        """
+        if is_player1:
+            self.player1_ships_afloat -= 1
+            return self.player1_ships_afloat
+        self.player2_ships_afloat -= 1
+        return self.player2_ships_afloat
+    
+    def get_shot_dicts(self, is_player1: bool) -> List[dict]:
+        """
+        Obtiene el historial de disparos de un jugador ya serializado.
+        
+        Cada disparo se serializa una sola vez, la primera vez que se lee el
+        historial. La tupla cacheada no se modifica: se reemplaza por una
+        nueva con los disparos pendientes, así que lecturas concurrentes
+        nunca duplican disparos (a lo sumo serializan los mismos dos veces).
+        
+        Args:
+            is_player1: True para los disparos del jugador 1
+            
+        Returns:
+            Tupla de diccionarios (compartida)
+        """
+        shots = self.player1_shots if is_player1 else self.player2_shots
+        dicts = self.player1_shot_dicts if is_player1 else self.player2_shot_dicts
+        if len(dicts) < len(shots):
+            dicts += tuple(_shot_to_dict(shot) for shot in shots[len(dicts):])
+            if is_player1:
+                self.player1_shot_dicts = dicts
+            else:
+                self.player2_shot_dicts = dicts
+        return dicts
+    
     def get_stats(self, player_id: Optional[str] = None) -> Dict[str, int]:
         """
         Obtiene estadísticas de la partida.
         
+        Se arma a partir de los contadores que record_shot mantiene en cada
+        disparo y de los barcos a flote de cada flota (que descuenta
+        sink_ship), sin recorrer disparos ni barcos.
+        
         Args:
             player_id: ID del jugador para el cual obtener stats (None = jugador 1)
         """
+        is_player1 = player_id is None or player_id == self.player1_id
+        
         # Determinar qué jugador
-        if player_id is None or player_id == self.player1_id:
-            my_shots = self.player1_shots
-            my_ships = self.player1_ships
-            enemy_ships = self.player2_ships
-            enemy_shots = self.player2_shots
+        if is_player1:
+            my_total, my_misses = len(self.player1_shots), self.player1_misses
+            enemy_total, enemy_misses = len(self.player2_shots), self.player2_misses
+            ships_total, ships_afloat = len(self.player1_ships), self.player1_ships_afloat
+            enemy_ships_sunk = len(self.player2_ships) - self.player2_ships_afloat
         else:
-            my_shots = self.player2_shots
-            my_ships = self.player2_ships
-            enemy_ships = self.player1_ships
-            enemy_shots = self.player1_shots
+            my_total, my_misses = len(self.player2_shots), self.player2_misses
+            enemy_total, enemy_misses = len(self.player1_shots), self.player1_misses
+            ships_total, ships_afloat = len(self.player2_ships), self.player2_ships_afloat
+            enemy_ships_sunk = len(self.player1_ships) - self.player1_ships_afloat
         
-        # Estadísticas de mis disparos
-        player_hits = sum(1 for shot in my_shots if shot.result in ["hit", "sunk"])
-        player_misses = sum(1 for shot in my_shots if shot.result == "water")
-        
-        # Mis barcos
-        player_ships_sunk = sum(1 for ship in my_ships if ship.is_sunk)
-        
-        # Barcos enemigos hundidos
-        enemy_ships_sunk = sum(1 for ship in enemy_ships if ship.is_sunk)
-        print(f"🔵 DEBUG get_stats: player_id={player_id}, enemy_ships count={len(enemy_ships)}, enemy_ships_sunk={enemy_ships_sunk}")
-        print(f"🔵 DEBUG: my_ships count={len(my_ships)}, my_ships_sunk={player_ships_sunk}")
-        for ship in my_ships:
-            print(f"  MY - {ship.ship_name}: is_sunk={ship.is_sunk}, id={id(ship)}")
-        for ship in enemy_ships:
-            print(f"  ENEMY - {ship.ship_name}: is_sunk={ship.is_sunk}, id={id(ship)}")
-        
-        # Estadísticas de disparos enemigos
-        enemy_hits = sum(1 for shot in enemy_shots if shot.result in ["hit", "sunk"])
-        enemy_misses = sum(1 for shot in enemy_shots if shot.result == "water")
+        my_hits = my_total - my_misses
         
         # Calcular duración del juego
-        if self.finished_at:
-            duration = int((self.finished_at - self.created_at).total_seconds())
-        else:
-            duration = int((datetime.now() - self.created_at).total_seconds())
+        end = self.finished_at or datetime.now()
+        duration = int((end - self.created_at).total_seconds())
         
         # Calcular precisión
-        accuracy = round((player_hits / len(my_shots) * 100), 2) if len(my_shots) > 0 else 0
+        accuracy = round((my_hits / my_total * 100), 2) if my_total > 0 else 0
         
         return {
             # Mis disparos
-            "total_shots": len(my_shots),
-            "hits": player_hits,
-            "misses": player_misses,
+            "total_shots": my_total,
+            "hits": my_hits,
+            "misses": my_misses,
             "accuracy": accuracy,
             
             # Mis barcos
-            "ships_total": len(my_ships),
-            "ships_remaining": len(my_ships) - player_ships_sunk,
-            "ships_sunk": player_ships_sunk,
+            "ships_total": ships_total,
+            "ships_remaining": ships_afloat,
+            "ships_sunk": ships_total - ships_afloat,
             
             # Barcos enemigos
             "enemy_ships_sunk": enemy_ships_sunk,
             
             # Disparos enemigos
-            "enemy_total_shots": len(enemy_shots),
-            "enemy_hits": enemy_hits,
+            "enemy_total_shots": enemy_total,
+            "enemy_hits": enemy_total - enemy_misses,
             "enemy_misses": enemy_misses,
             
             # Tiempo
@@ -1,7 +1,9 @@
 """
 Almacenamiento en memoria para todos los datos del sistema.
 """
-from typing import Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, KeysView, TypeVar
+from collections import OrderedDict
+from itertools import count
 from datetime import datetime
 import uuid
 import hashlib
@@ -28,7 +30,117 @@ games_db: Dict[str, Game] = {}
 
 # Índices secundarios para búsquedas rápidas
 username_to_user_id: Dict[str, str] = {}
-player_games: Dict[str, list] = {}  # player_id -> [game_ids]
+# player_id -> {game_id: orden}: partidas en el orden en que el jugador entró
+# (altas y bajas O(1))
+player_games: Dict[str, Dict[str, int]] = {}
+# (player_id, status) -> {game_id: Game}: partidas de cada jugador por estado,
+# en el mismo orden que player_games
+player_status_games: Dict[tuple[str, str], Dict[str, Game]] = {}
+# game_id -> Game: partidas multijugador esperando jugador 2 (más recientes primero)
+waiting_multiplayer_games: "OrderedDict[str, Game]" = OrderedDict()
+# Secuencia creciente con la que se registra cada partida en player_games
+_player_game_order = count()
+
+# Versión del catálogo (plantillas y flotas base); se incrementa en cada
+# modificación para invalidar las cachés derivadas
+_catalog_version = 0
+
+
+def get_catalog_version() -> int:
+    """Obtiene la versión actual del catálogo de plantillas y flotas base."""
+    return _catalog_version
+
+
+def _bump_catalog_version() -> None:
+    """Marca el catálogo como modificado."""
+    global _catalog_version
+    _catalog_version += 1
+
+
+# Versión del índice de partidas en espera; cambia cada vez que una partida
+# entra o sale del lobby multijugador
+_waiting_games_version = 0
+
+
+def get_waiting_games_version() -> int:
+    """Obtiene la versión actual del índice de partidas en espera."""
+    return _waiting_games_version
+
+
+def _remove_waiting_game(game_id: str) -> None:
+    """Quita una partida del índice de espera (si estaba) y marca el cambio."""
+    global _waiting_games_version
+    if waiting_multiplayer_games.pop(game_id, None) is not None:
+        _waiting_games_version += 1
+
+
+# Todos los diccionarios del almacenamiento, datos e índices; reset,
+# snapshot y restore los recorren, así que un índice nuevo debe agregarse aquí
+_STORAGE = (
+    users_db,
+    ship_templates_db,
+    base_fleets_db,
+    games_db,
+    username_to_user_id,
+    player_games,
+    player_status_games,
+    waiting_multiplayer_games
+)
+
+# Cachés derivadas del almacenamiento (lru_cache de otros módulos)
+_derived_caches: list = []
+
+_CachedFunction = TypeVar("_CachedFunction", bound=Callable[..., Any])
+
+
+def register_derived_cache(cached: _CachedFunction) -> _CachedFunction:
+    """
+    Registra una función con lru_cache para vaciarla en reset.
+    
+    Se usa como decorador sobre @lru_cache en los módulos que memoizan
+    datos del almacenamiento.
+    
+    Args:
+        cached: Función envuelta por lru_cache
+    
+    Returns:
+        La misma función
+    """
+    _derived_caches.append(cached)
+    return cached
+
+
+def reset() -> None:
+    """
+    Vacía el almacenamiento: datos, índices y cachés derivadas.
+    
+    Las versiones del catálogo y del lobby cambian para que ninguna
+    respuesta cacheada (ETag incluido) sobreviva al vaciado.
+    """
+    global _waiting_games_version
+    for container in _STORAGE:
+        container.clear()
+    for cached in _derived_caches:
+        cached.cache_clear()
+    _bump_catalog_version()
+    _waiting_games_version += 1
+
+
+def snapshot() -> list[dict]:
+    """Copia superficial de cada diccionario del almacenamiento (ver restore)."""
+    return [container.copy() for container in _STORAGE]
+
+
+def restore(saved: list[dict]) -> None:
+    """
+    Vuelve al estado guardado con snapshot.
+    
+    Args:
+        saved: Resultado de snapshot()
+    """
+    reset()
+    for container, contents in zip(_STORAGE, saved):
+        container.update(contents)
 
 
 def initialize_default_admin():
@@ -68,6 +180,17 @@ def get_user_by_id(user_id: str) -> User | None:
     return users_db.get(user_id)
 
 
+def get_username(user_id: str) -> str | None:
+    """
+    Obtiene el nombre de usuario a partir de su ID.
+    
+    users_db ya es el diccionario que create_user llena, así que la consulta
+    es O(1) y nunca guarda resultados de usuarios inexistentes.
+    """
+    user = users_db.get(user_id)
+    return user.username if user else None
+
+
 def create_user(username: str, password: str, role: str) -> User:
     """Crea un nuevo usuario."""
     user_id = str(uuid.uuid4())
@@ -107,6 +230,7 @@ def create_ship_template(name: str, size: int, description: str | None,
     )
     
     ship_templates_db[template_id] = template
+    _bump_catalog_version()
     return template
 
 
@@ -115,11 +239,38 @@ def get_ship_template(template_id: str) -> ShipTemplate | None:
     return ship_templates_db.get(template_id)
 
 
+def get_ship_templates_bulk(template_ids: Iterable[str]) -> Dict[str, ShipTemplate]:
+    """
+    Obtiene varias plantillas de barco en una sola operación.
+    
+    Args:
+        template_ids: IDs a buscar (se ignoran duplicados e inexistentes)
+        
+    Returns:
+        Diccionario template_id -> ShipTemplate con las plantillas encontradas
+    """
+    return {
+        tid: ship_templates_db[tid]
+        for tid in set(template_ids)
+        if tid in ship_templates_db
+    }
+
+
 def get_all_ship_templates() -> list[ShipTemplate]:
     """Obtiene todas las plantillas de barcos."""
     return list(ship_templates_db.values())
 
 
+def get_all_ship_template_ids() -> KeysView[str]:
+    """
+    Obtiene los IDs de todas las plantillas de barcos.
+    
+    Retorna una vista del diccionario: se comporta como un conjunto
+    (admite diferencia e intersección) y siempre refleja el estado actual.
+    """
+    return ship_templates_db.keys()
+
+
 def update_ship_template(template_id: str, name: str | None = None, 
                         size: int | None = None, 
                         description: str | None = None) -> ShipTemplate | None:
@@ -135,6 +286,7 @@ def update_ship_template(template_id: str, name: str | None = None,
     if description is not None:
         template.description = description
     
+    _bump_catalog_version()
     return template
 
 
@@ -142,6 +294,7 @@ def delete_ship_template(template_id: str) -> bool:
     """Elimina una plantilla de barco."""
     if template_id in ship_templates_db:
         del ship_templates_db[template_id]
+        _bump_catalog_version()
         return True
     return False
 
@@ -161,10 +314,10 @@ def validate_fleet_capacity(board_size: int, ship_template_ids: list[str]) -> tu
             total_cells += template.size
     
     board_total_cells = board_size * board_size
-    max_allowed_cells = board_total_cells * 0.8
+    max_allowed_cells = board_total_cells * 4 // 5  # 80%, en aritmética entera
     
     if total_cells > max_allowed_cells:
-        return False, f"Los barcos ocupan {total_cells} celdas, pero el máximo permitido es {int(max_allowed_cells)} celdas (80% de {board_total_cells})"
+        return False, f"Los barcos ocupan {total_cells} celdas, pero el máximo permitido es {max_allowed_cells} celdas (80% de {board_total_cells})"
     
     return True, ""
 
@@ -184,6 +337,7 @@ def create_base_fleet(name: str, board_size: int, ship_template_ids: list[str],
     )
     
     base_fleets_db[fleet_id] = fleet
+    _bump_catalog_version()
     return fleet
 
 
@@ -211,7 +365,9 @@ def update_base_fleet(fleet_id: str, name: str | None = None,
         fleet.board_size = board_size
     if ship_template_ids is not None:
         fleet.ship_template_ids = ship_template_ids
+        fleet.ship_count = len(ship_template_ids)
     
+    _bump_catalog_version()
     return fleet
 
 
@@ -219,14 +375,17 @@ def delete_base_fleet(fleet_id: str) -> bool:
     """Elimina una flota base."""
     if fleet_id in base_fleets_db:
         del base_fleets_db[fleet_id]
+        _bump_catalog_version()
         return True
     return False
 
 
 # Funciones auxiliares para partidas
 def create_game(player1_id: str, base_fleet_id: str, board_size: int, 
-               player1_abb_tree, player1_fleet_tree, is_multiplayer: bool = False) -> Game:
-    """Crea una nueva partida."""
+               player1_abb_tree, player1_fleet_tree, is_multiplayer: bool = False,
+               ships_to_place: int = 0) -> Game:
+    """Crea una nueva partida (ships_to_place: barcos por colocar de cada jugador)."""
+    global _waiting_games_version
     game_id = str(uuid.uuid4())
     
     game = Game(
@@ -238,42 +397,146 @@ def create_game(player1_id: str, base_fleet_id: str, board_size: int,
         is_multiplayer=is_multiplayer,
         player1_abb_tree=player1_abb_tree,
         player1_fleet_tree=player1_fleet_tree,
-        current_turn_player_id=None if is_multiplayer else player1_id
+        current_turn_player_id=None if is_multiplayer else player1_id,
+        player1_ships_to_place=ships_to_place,
+        player2_ships_to_place=ships_to_place
     )
     
     games_db[game_id] = game
     
-    # Actualizar índice de partidas por jugador
-    if player1_id not in player_games:
-        player_games[player1_id] = []
-    player_games[player1_id].append(game_id)
+    # Actualizar índices de partidas por jugador
+    player_games.setdefault(player1_id, {})[game_id] = next(_player_game_order)
+    player_status_games.setdefault((player1_id, game.status), {})[game_id] = game
+    if game.status == "waiting_for_player2":
+        waiting_multiplayer_games[game_id] = game
+        waiting_multiplayer_games.move_to_end(game_id, last=False)
+        _waiting_games_version += 1
     
     return game
 
 
+def _index_game_status(game: Game, old_status: str | None) -> None:
+    """
+    Mueve la partida al bucket (jugador, estado) actual de cada jugador.
+    
+    Args:
+        game: Partida
+        old_status: Estado anterior (None si la partida sale del índice)
+    """
+    for player_id in (game.player1_id, game.player2_id):
+        if player_id is None:
+            continue
+        if old_status is not None:
+            player_status_games.get((player_id, old_status), {}).pop(game.id, None)
+        _add_to_status_bucket(player_id, game)
+
+
+def _add_to_status_bucket(player_id: str, game: Game) -> None:
+    """
+    Agrega la partida al bucket (jugador, estado) respetando el orden de
+    player_games.
+    
+    Lo habitual es que la partida sea la más reciente del bucket y baste con
+    agregarla al final; si no, se construye un bucket nuevo ya ordenado (en
+    lugar de reordenar el existente mientras otra petición lo recorre).
+    
+    Args:
+        player_id: ID del jugador
+        game: Partida (ya con su estado nuevo)
+    """
+    key = (player_id, game.status)
+    bucket = player_status_games.setdefault(key, {})
+    order = player_games.get(player_id, {})
+    position = order.get(game.id, -1)
+    if not bucket or order.get(next(reversed(bucket)), -1) < position:
+        bucket[game.id] = game
+        return
+    
+    entries = [*bucket.items(), (game.id, game)]
+    entries.sort(key=lambda entry: order.get(entry[0], -1))
+    player_status_games[key] = dict(entries)
+
+
+def set_game_status(game: Game, status: str) -> None:
+    """
+    Cambia el estado de una partida manteniendo el índice por estado.
+    
+    Todas las transiciones de estado deben pasar por aquí.
+    
+    Args:
+        game: Partida
+        status: Nuevo estado
+    """
+    old_status = game.status
+    if old_status == status:
+        return
+    game.status = status
+    _index_game_status(game, old_status)
+    if old_status == "waiting_for_player2":
+        _remove_waiting_game(game.id)
+
+
 def get_game(game_id: str) -> Game | None:
     """Obtiene una partida por su ID."""
     return games_db.get(game_id)
 
 
-def get_player_games(player_id: str) -> list[Game]:
-    """Obtiene todas las partidas de un jugador."""
-    game_ids = player_games.get(player_id, [])
+def get_player_games(player_id: str, status: str | None = None) -> list[Game]:
+    """
+    Obtiene las partidas de un jugador, opcionalmente filtradas por estado.
+    
+    Con estado se consulta directamente el índice (jugador, estado), sin
+    recorrer el resto de partidas del jugador; el bucket ya está en el orden
+    del listado sin filtro.
+    """
+    if status is not None:
+        bucket = player_status_games.get((player_id, status), {})
+        return [game for gid, game in bucket.items() if gid in games_db]
+    
+    game_ids = player_games.get(player_id, {})
     return [games_db[gid] for gid in game_ids if gid in games_db]
 
 
+def get_waiting_multiplayer_games() -> Iterator[Game]:
+    """
+    Itera las partidas multijugador que esperan jugador 2, más recientes primero.
+    
+    Las partidas se insertan al inicio del índice, así que el orden por
+    created_at descendente se mantiene sin ordenar en cada consulta.
+    """
+    return (
+        game for game_id, game in waiting_multiplayer_games.items()
+        if game_id in games_db
+    )
+
+
 def get_all_games() -> list[Game]:
     """Obtiene todas las partidas."""
     return list(games_db.values())
 
 
+def delete_game(game_id: str) -> bool:
+    """Elimina una partida y la quita del índice de ambos jugadores."""
+    game = games_db.pop(game_id, None)
+    if not game:
+        return False
+    
+    for player_id in (game.player1_id, game.player2_id):
+        if player_id is not None:
+            player_games.get(player_id, {}).pop(game_id, None)
+            player_status_games.get((player_id, game.status), {}).pop(game_id, None)
+    _remove_waiting_game(game_id)
+    
+    return True
+
+
 def update_game_status(game_id: str, status: str) -> Game | None:
     """Actualiza el estado de una partida."""
     game = games_db.get(game_id)
     if not game:
         return None
     
-    game.status = status
+    set_game_status(game, status)
     if status == "finished":
         game.finished_at = datetime.now()
     
@@ -310,11 +573,9 @@ def join_game_as_player2(game_id: str, player2_id: str, player2_abb_tree, player
     game.player2_id = player2_id
     game.player2_abb_tree = player2_abb_tree
     game.player2_fleet_tree = player2_fleet_tree
-    game.status = "both_players_setup"  # Ambos jugadores pueden colocar barcos simultáneamente
     
-    # Actualizar índice de partidas por jugador
-    if player2_id not in player_games:
-        player_games[player2_id] = []
-    player_games[player2_id].append(game_id)
+    # Actualizar índices de partidas por jugador
+    player_games.setdefault(player2_id, {})[game_id] = next(_player_game_order)
+    set_game_status(game, "both_players_setup")  # Ambos jugadores pueden colocar barcos simultáneamente
     
     return game
@@ -61,6 +61,29 @@ class BinarySearchTree:
             else:
                 self._insert_recursive(current.right, new_node)
     
+    def build_from_sorted(self, nodes: List[Node]) -> None:
+        """
+        Replace the tree contents with a balanced tree built from sorted nodes.
+        
+        Each subtree root is the middle node of its range, so the result has
+        the same shape as inserting the nodes in balance_array_for_bst order,
+        but without walking the tree for each insertion.
+        
+        Args:
+            nodes: Nodes sorted by id, with unique ids
+        """
+        def build(low: int, high: int) -> Optional[Node]:
+            if low > high:
+                return None
+            mid = (low + high) // 2
+            node = nodes[mid]
+            node.left = build(low, mid - 1)
+            node.right = build(mid + 1, high)
+            return node
+        
+        self.root = build(0, len(nodes) - 1)
+        self._size = len(nodes)
+    
     def search(self, id: int) -> Optional[Node]:
         """
         Search for a node by its id.
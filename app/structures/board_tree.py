@@ -0,0 +1,152 @@
+"""
+ABB de coordenadas de un tablero con mapas planos de ocupación y disparos.
+
+El ABB conserva todas las coordenadas del tablero; las consultas frecuentes
+("¿ya se disparó aquí?", "¿está ocupada?") se resuelven con un índice directo
+en un bytearray en lugar de recorrer el árbol. Por eso los nodos del árbol
+pueden crearse de forma diferida, la primera vez que se accede a la raíz.
+
+Índice de una celda: (fila - 1) * board_size + (columna - 1)
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from app.structures.abb_node import Node
+from app.structures.binary_search_tree import BinarySearchTree
+from app.structures.coordinate_utils import ROW_LETTERS, coordinate_to_code
+
+
+@lru_cache(maxsize=32)
+def _cell_index_table(board_size: int) -> Dict[str, int]:
+    """
+    Índice de celda de cada coordenada ("A1" -> 0), memoizado por tamaño.
+
+    Args:
+        board_size: Tamaño del tablero
+
+    Returns:
+        Diccionario coordenada -> índice de celda
+    """
+    return {
+        f"{ROW_LETTERS[row]}{col + 1}": row * board_size + col
+        for row in range(board_size)
+        for col in range(board_size)
+    }
+
+
+class BoardTree(BinarySearchTree):
+    """
+    ABB de un tablero NxN con mapas de bytes por celda.
+
+    Attributes:
+        board_size: Tamaño del tablero (N)
+        multiplier: Multiplicador de fila usado en los códigos (10 o 100)
+        shot_cells: 1 si la celda fue disparada (escribir con mark_shot)
+        occupied_cells: 1 si la celda tiene un barco
+        shot_count: Celdas disparadas, mantenido por mark_shot
+    """
+
+    def __init__(self, board_size: int):
+        """
+        Inicializa un tablero vacío.
+
+        Args:
+            board_size: Tamaño del tablero (NxN)
+        """
+        self._pending_nodes: Optional[Callable[[], List[Node]]] = None
+        super().__init__()
+        self.board_size = board_size
+        self.multiplier = 100 if board_size >= 10 else 10
+        self.shot_cells = bytearray(board_size * board_size)
+        self.occupied_cells = bytearray(board_size * board_size)
+        self.shot_count = 0
+
+    @property
+    def root(self) -> Optional[Node]:
+        """Raíz del ABB; construye los nodos diferidos en el primer acceso."""
+        if self._pending_nodes is not None:
+            make_nodes = self._pending_nodes
+            self._pending_nodes = None
+            self.build_from_sorted(make_nodes())
+        return self._root
+
+    @root.setter
+    def root(self, node: Optional[Node]) -> None:
+        # Asignar la raíz (insert, delete, clear...) descarta la construcción
+        # diferida pendiente
+        self._pending_nodes = None
+        self._root = node
+
+    @property
+    def nodes_built(self) -> bool:
+        """True si los nodos del ABB ya existen (no hay construcción pendiente)."""
+        return self._pending_nodes is None
+
+    def build_from_sorted_lazily(self, make_nodes: Callable[[], List[Node]], size: int) -> None:
+        """
+        Difiere build_from_sorted hasta el primer acceso a la raíz.
+
+        Las partidas solo usan los mapas de celdas, así que la mayoría nunca
+        llega a crear los board_size² nodos.
+
+        Args:
+            make_nodes: Función que devuelve los nodos ordenados por id
+            size: Número de nodos que devolverá make_nodes
+        """
+        self._pending_nodes = make_nodes
+        self._size = size
+
+    def cell_index(self, code: int) -> int:
+        """
+        Convierte un código de coordenada en el índice de su celda.
+
+        Args:
+            code: Código de coordenada (fila * multiplicador + columna)
+
+        Returns:
+            Índice en los mapas de celdas
+        """
+        row, col = divmod(code, self.multiplier)
+        return (row - 1) * self.board_size + col - 1
+
+    def coordinate_index(self, coordinate: str) -> int:
+        """
+        Convierte una coordenada ("B5") en el índice de su celda.
+
+        Las coordenadas habituales se resuelven con una tabla precalculada;
+        el resto (minúsculas, formato inválido) pasa por coordinate_to_code,
+        que las normaliza o lanza el mismo ValueError de siempre.
+
+        Args:
+            coordinate: Coordenada en formato letra+número
+
+        Returns:
+            Índice en los mapas de celdas
+
+        Raises:
+            ValueError: Si la coordenada no es válida para el tablero
+        """
+        index = _cell_index_table(self.board_size).get(coordinate)
+        if index is None:
+            index = self.cell_index(coordinate_to_code(coordinate, self.board_size))
+        return index
+
+    def mark_shot(self, code: int) -> None:
+        """
+        Marca una celda como disparada y actualiza el contador.
+
+        Args:
+            code: Código de coordenada
+        """
+        self.mark_shot_index(self.cell_index(code))
+
+    def mark_shot_index(self, index: int) -> None:
+        """
+        Marca una celda (por índice) como disparada y actualiza el contador.
+
+        Args:
+            index: Índice de la celda
+        """
+        if not self.shot_cells[index]:
+            self.shot_cells[index] = 1
+            self.shot_count += 1
@@ -1,17 +1,32 @@
 """
 Utilidades para manejo de coordenadas del tablero.
 
-Codificación: FilaNumérica × 10 + Columna
-Ejemplo: A1 → 11, B3 → 23, J10 → 100
+Codificación: FilaNumérica × multiplicador + Columna, con multiplicador 10
+para tableros menores de 10 y 100 para el resto.
+Ejemplo (5x5): A1 → 11, B3 → 23; (10x10): A1 → 101, J10 → 1010
+
+Las conversiones frecuentes no calculan nada: se resuelven con tablas por
+tamaño de tablero (resolve_coordinate) y rangos de enteros (get_ship_codes).
 """
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import re
+import string
+
 
+# Letra de cada fila (fila 1 -> "A") y su inversa
+ROW_LETTERS = string.ascii_uppercase
+_LETTER_TO_ROW = {letter: row for row, letter in enumerate(ROW_LETTERS, start=1)}
 
+
+@lru_cache(maxsize=1024)
 def coordinate_to_code(coordinate: str, board_size: int = 10) -> int:
     """
     Convierte una coordenada en formato "A1" a su código numérico.
     
+    La conversión es pura, así que se memoiza: el dominio útil son las
+    board_size² coordenadas de cada tablero. Los errores no se memoizan.
+    
     Args:
         coordinate: Coordenada en formato letra+número (ej: "A1", "J10")
         board_size: Tamaño del tablero (para determinar el multiplicador)
@@ -23,12 +38,12 @@ def coordinate_to_code(coordinate: str, board_size: int = 10) -> int:
         ValueError: Si el formato de la coordenada es inválido
     
     Examples:
-        >>> coordinate_to_code("A1", 10)
-        11
-        >>> coordinate_to_code("B3", 10)
+        >>> coordinate_to_code("B3", 5)
         23
+        >>> coordinate_to_code("A1", 10)
+        101
         >>> coordinate_to_code("J10", 10)
-        100
+        1010
         >>> coordinate_to_code("A12", 15)
         112
     """
@@ -40,7 +55,7 @@ def coordinate_to_code(coordinate: str, board_size: int = 10) -> int:
     letter, number = match.groups()
     
     # Convertir letra a número (A=1, B=2, ..., Z=26)
-    row = ord(letter) - ord('A') + 1
+    row = _LETTER_TO_ROW[letter]
     col = int(number)
     
     # Validar que la fila esté en rango válido
@@ -75,11 +90,11 @@ def code_to_coordinate(code: int, board_size: int = 10) -> str:
         Coordenada en formato letra+número
     
     Examples:
-        >>> code_to_coordinate(11, 10)
-        'A1'
-        >>> code_to_coordinate(23, 10)
+        >>> code_to_coordinate(23, 5)
         'B3'
-        >>> code_to_coordinate(100, 10)
+        >>> code_to_coordinate(101, 10)
+        'A1'
+        >>> code_to_coordinate(1010, 10)
         'J10'
         >>> code_to_coordinate(112, 15)
         'A12'
@@ -91,11 +106,57 @@ def code_to_coordinate(code: int, board_size: int = 10) -> str:
     col = code % multiplier
     
     # Convertir número a letra (1=A, 2=B, ..., 26=Z)
-    letter = chr(ord('A') + row - 1)
+    letter = ROW_LETTERS[row - 1] if 1 <= row <= 26 else chr(ord('A') + row - 1)
     
     return f"{letter}{col}"
 
 
+@lru_cache(maxsize=32)
+def _coordinate_table(board_size: int) -> Dict[str, Tuple[str, int]]:
+    """
+    Coordenada -> (coordenada compartida, código) de un tablero, memoizado.
+    
+    Args:
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Diccionario con una entrada por celda del tablero
+    """
+    table = {}
+    for code in generate_coordinate_codes(board_size):
+        coordinate = code_to_coordinate(code, board_size)
+        table[coordinate] = (coordinate, code)
+    return table
+
+
+def resolve_coordinate(coordinate: str, board_size: int = 10) -> Tuple[str, int]:
+    """
+    Obtiene la coordenada compartida del tablero y su código.
+    
+    Las coordenadas del tablero se resuelven con una tabla por tamaño, de
+    modo que todos los objetos que las guardan comparten la misma cadena y no
+    se vuelve a analizar el texto. El resto pasa por coordinate_to_code.
+    
+    Args:
+        coordinate: Coordenada en formato "A1"
+        board_size: Tamaño del tablero
+    
+    Returns:
+        Tupla (coordenada, código)
+    
+    Raises:
+        ValueError: Si el formato de la coordenada es inválido
+    
+    Examples:
+        >>> resolve_coordinate("B3", 10)
+        ('B3', 203)
+    """
+    entry = _coordinate_table(board_size).get(coordinate)
+    if entry is None:
+        return coordinate, coordinate_to_code(coordinate, board_size)
+    return entry
+
+
 def generate_all_coordinates(board_size: int) -> List[str]:
     """
     Genera todas las coordenadas posibles para un tablero de tamaño NxN.
@@ -113,7 +174,7 @@ def generate_all_coordinates(board_size: int) -> List[str]:
     coordinates = []
     
     for row in range(1, board_size + 1):
-        letter = chr(ord('A') + row - 1)
+        letter = ROW_LETTERS[row - 1]
         for col in range(1, board_size + 1):
             coordinates.append(f"{letter}{col}")
     
@@ -210,34 +271,45 @@ def validate_coordinate(coordinate: str, board_size: int) -> bool:
         True si la coordenada es válida, False en caso contrario
     """
     try:
+        # Las coordenadas canónicas del tablero están en su tabla; solo el
+        # resto (minúsculas, ceros a la izquierda, inválidas) se analiza
+        if coordinate in _coordinate_table(board_size):
+            return True
+        
         # Extraer fila y columna directamente del string
         match = re.match(r'^([A-Z])(\d+)$', coordinate.upper())
         if not match:
             return False
         
         letter, number = match.groups()
-        row = ord(letter) - ord('A') + 1
+        row = _LETTER_TO_ROW[letter]
         col = int(number)
         
         # Validar rangos
         return 1 <= row <= board_size and 1 <= col <= board_size
-    except (ValueError, AttributeError):
+    except (ValueError, AttributeError, TypeError):
         return False
 
 
-def get_adjacent_coordinates(coordinate: str, board_size: int, 
-                            orientation: str, length: int) -> List[str]:
+def get_ship_codes(coordinate: str, board_size: int,
+                   orientation: str, length: int,
+                   start_code: Optional[int] = None) -> List[int]:
     """
-    Obtiene las coordenadas adyacentes para colocar un barco.
+    Obtiene los códigos de las celdas que ocuparía un barco.
+    
+    Trabaja solo con enteros (fila * multiplicador + columna); las
+    coordenadas en texto se generan únicamente cuando se necesitan.
     
     Args:
         coordinate: Coordenada inicial
         board_size: Tamaño del tablero
         orientation: "horizontal" o "vertical"
         length: Longitud del barco
+        start_code: Código de la coordenada inicial si el llamador ya la
+            resolvió (evita volver a resolverla)
     
     Returns:
-        Lista de coordenadas que ocuparía el barco
+        Lista de códigos que ocuparía el barco
     
     Raises:
         ValueError: Si el barco no cabe en el tablero
@@ -245,46 +317,55 @@ def get_adjacent_coordinates(coordinate: str, board_size: int,
     # Usar multiplicador apropiado según tamaño del tablero
     multiplier = 100 if board_size >= 10 else 10
     
-    try:
-        code = coordinate_to_code(coordinate, board_size)
-    except ValueError as e:
-        raise ValueError(f"Error al convertir coordenada '{coordinate}': {e}")
+    if start_code is not None:
+        code = start_code
+    else:
+        try:
+            _, code = resolve_coordinate(coordinate, board_size)
+        except ValueError as e:
+            raise ValueError(f"Error al convertir coordenada '{coordinate}': {e}")
     
     row = code // multiplier
     col = code % multiplier
     
-    coordinates = []
-    
     if orientation == "horizontal":
         # Verificar que cabe horizontalmente
         if col + length - 1 > board_size:
             raise ValueError(f"El barco no cabe horizontalmente desde {coordinate}. Columna final: {col + length - 1}, Tamaño tablero: {board_size}")
         
-        for i in range(length):
-            new_code = row * multiplier + (col + i)
-            try:
-                coord = code_to_coordinate(new_code, board_size)
-                coordinates.append(coord)
-            except Exception as e:
-                raise ValueError(f"Error generando coordenada horizontal {i}: code={new_code}, board_size={board_size}, error={e}")
-    
-    elif orientation == "vertical":
+        return list(range(code, code + length))
+    
+    if orientation == "vertical":
         # Verificar que cabe verticalmente
         if row + length - 1 > board_size:
             raise ValueError(f"El barco no cabe verticalmente desde {coordinate}. Fila final: {row + length - 1}, Tamaño tablero: {board_size}")
         
-        for i in range(length):
-            new_code = (row + i) * multiplier + col
-            try:
-                coord = code_to_coordinate(new_code, board_size)
-                coordinates.append(coord)
-            except Exception as e:
-                raise ValueError(f"Error generando coordenada vertical {i}: code={new_code}, board_size={board_size}, error={e}")
+        return list(range(code, code + length * multiplier, multiplier))
     
-    else:
-        raise ValueError(f"Orientación inválida: {orientation}")
+    raise ValueError(f"Orientación inválida: {orientation}")
+
+
+def get_adjacent_coordinates(coordinate: str, board_size: int, 
+                            orientation: str, length: int) -> List[str]:
+    """
+    Obtiene las coordenadas adyacentes para colocar un barco.
     
-    return coordinates
+    Args:
+        coordinate: Coordenada inicial
+        board_size: Tamaño del tablero
+        orientation: "horizontal" o "vertical"
+        length: Longitud del barco
+    
+    Returns:
+        Lista de coordenadas que ocuparía el barco
+    
+    Raises:
+        ValueError: Si el barco no cabe en el tablero
+    """
+    return [
+        code_to_coordinate(code, board_size)
+        for code in get_ship_codes(coordinate, board_size, orientation, length)
+    ]
 
 
 def coordinates_overlap(coords1: List[str], coords2: List[str]) -> bool:
@@ -102,40 +102,17 @@ def clean_storage() -> Generator:
     """
     Fixture: limpiar almacenamiento en memoria antes y después de cada test.
     
-    Guarda el estado actual, limpia los diccionarios, ejecuta el test,
-    y luego restaura el estado original.
+    Guarda el estado actual, limpia datos, índices y cachés derivadas,
+    ejecuta el test y luego restaura el estado original.
     """
-    # Guardar estado actual
-    users_backup = store.users_db.copy()
-    ship_templates_backup = store.ship_templates_db.copy()
-    base_fleets_backup = store.base_fleets_db.copy()
-    games_backup = store.games_db.copy()
-    username_to_user_id_backup = store.username_to_user_id.copy()
-    player_games_backup = store.player_games.copy()
-    
-    # Limpiar diccionarios
-    store.users_db.clear()
-    store.ship_templates_db.clear()
-    store.base_fleets_db.clear()
-    store.games_db.clear()
-    store.username_to_user_id.clear()
-    store.player_games.clear()
+    # Guardar estado actual y limpiar datos, índices y cachés
+    saved = store.snapshot()
+    store.reset()
     
     yield
     
     # Restaurar estado original
-    store.users_db.clear()
-    store.users_db.update(users_backup)
-    store.ship_templates_db.clear()
-    store.ship_templates_db.update(ship_templates_backup)
-    store.base_fleets_db.clear()
-    store.base_fleets_db.update(base_fleets_backup)
-    store.games_db.clear()
-    store.games_db.update(games_backup)
-    store.username_to_user_id.clear()
-    store.username_to_user_id.update(username_to_user_id_backup)
-    store.player_games.clear()
-    store.player_games.update(player_games_backup)
+    store.restore(saved)
 
 
 @pytest.fixture
@@ -0,0 +1,111 @@
+"""
+Tests de configuración global de la aplicación.
+"""
+import pytest
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import app
+
+
+client = TestClient(app)
+
+
+class TestDefaultResponseClass:
+    """Tests de la clase de respuesta por defecto."""
+
+    def test_all_routes_serialize_with_orjson(self):
+        """Todas las rutas usan ORJSONResponse salvo que definan otra."""
+        for route in app.routes:
+            if not isinstance(route, APIRoute):
+                continue
+
+            response_class = route.response_class
+            if isinstance(response_class, DefaultPlaceholder):
+                response_class = response_class.value
+
+            assert issubclass(response_class, ORJSONResponse), route.path
+
+    def test_model_response_is_json(self, clean_storage):
+        """Las respuestas basadas en modelos Pydantic se sirven como JSON."""
+        client.post(
+            "/api/auth/register",
+            json={
+                "username": "player1",
+                "password": "password123",
+                "role": "player"
+            }
+        )
+        response = client.post(
+            "/api/auth/login",
+            json={
+                "username": "player1",
+                "password": "password123"
+            }
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["token_type"] == "bearer"
+
+
+class TestSettingsFromEnv:
+    """Tests de la lectura de configuración desde .env y el entorno."""
+
+    @pytest.fixture
+    def env_file(self, tmp_path, monkeypatch):
+        """Archivo .env temporal y entorno sin variables de la aplicación."""
+        for name in ("APP_PORT", "LOG_LEVEL", "CORS_ORIGINS", "app_port", "log_level"):
+            monkeypatch.delenv(name, raising=False)
+        path = tmp_path / ".env"
+        path.write_text("APP_PORT=9000\nLOG_LEVEL=DEBUG\n")
+        return str(path)
+
+    def test_env_file_values(self, env_file):
+        """Los valores del .env se aplican y los enteros se convierten."""
+        settings = Settings.from_env(env_file)
+
+        assert settings.app_port == 9000
+        assert settings.log_level == "DEBUG"
+
+    def test_environment_overrides_env_file(self, env_file, monkeypatch):
+        """Las variables de entorno tienen prioridad sobre el .env."""
+        monkeypatch.setenv("APP_PORT", "9100")
+
+        assert Settings.from_env(env_file).app_port == 9100
+
+    def test_keys_are_case_insensitive(self, env_file, monkeypatch):
+        """Los nombres de las variables no distinguen mayúsculas."""
+        monkeypatch.setenv("log_level", "WARNING")
+
+        assert Settings.from_env(env_file).log_level == "WARNING"
+
+    def test_cors_origins_default_allows_any(self, env_file):
+        """Sin CORS_ORIGINS se acepta cualquier origen."""
+        assert Settings.from_env(env_file).cors_origins == ("*",)
+
+    def test_cors_origins_from_json_list(self, env_file, monkeypatch):
+        """Una lista JSON se convierte en tupla."""
+        monkeypatch.setenv("CORS_ORIGINS", '["https://a.com", "https://b.com"]')
+
+        settings = Settings.from_env(env_file)
+
+        assert settings.cors_origins == ("https://a.com", "https://b.com")
+
+    @pytest.mark.parametrize("value", ['"https://a.com"', "https://a.com,https://b.com"])
+    def test_cors_origins_rejects_non_list(self, env_file, monkeypatch, value):
+        """Un valor que no es lista JSON falla con un mensaje que nombra la variable."""
+        monkeypatch.setenv("CORS_ORIGINS", value)
+
+        with pytest.raises(ValueError, match="CORS_ORIGINS"):
+            Settings.from_env(env_file)
+
+    def test_invalid_int_names_variable(self, env_file, monkeypatch):
+        """Un entero inválido falla con un mensaje que nombra la variable."""
+        monkeypatch.setenv("APP_PORT", "abc")
+
+        with pytest.raises(ValueError, match="APP_PORT"):
+            Settings.from_env(env_file)
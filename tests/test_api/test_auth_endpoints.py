@@ -132,6 +132,26 @@ class TestAuthLogin:
         
         assert response.status_code == 401
 
+    def test_login_missing_password(self, clean_storage):
+        """Login sin contraseña reporta el campo faltante bajo body."""
+        response = client.post(
+            "/api/auth/login",
+            json={"username": "player1"}
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "password"]
+
+    def test_login_invalid_json(self, clean_storage):
+        """Login con un cuerpo que no es JSON válido."""
+        response = client.post(
+            "/api/auth/login",
+            content=b"{username",
+            headers={"Content-Type": "application/json"}
+        )
+
+        assert response.status_code == 422
+
 
 class TestAuthMe:
     """Tests del endpoint /me."""
@@ -174,3 +194,43 @@ class TestAuthMe:
         response = client.get("/api/auth/me")
         
         assert response.status_code == 401
+    
+    def test_repeated_requests_reuse_token_verification(self, clean_storage, monkeypatch):
+        """Las peticiones repetidas con el mismo token no vuelven a decodificarlo."""
+        from app.core import dependencies
+        
+        client.post(
+            "/api/auth/register",
+            json={
+                "username": "player1",
+                "password": "password123",
+                "role": "player"
+            }
+        )
+        login_response = client.post(
+            "/api/auth/login",
+            json={
+                "username": "player1",
+                "password": "password123"
+            }
+        )
+        token = login_response.json()["access_token"]
+        
+        calls = []
+        original_decode = dependencies.decode_access_token
+        
+        def counting_decode(raw_token):
+            calls.append(raw_token)
+            return original_decode(raw_token)
+        
+        dependencies._token_cache.clear()
+        monkeypatch.setattr(dependencies, "decode_access_token", counting_decode)
+        
+        for _ in range(3):
+            response = client.get(
+                "/api/auth/me",
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200
+        
+        assert len(calls) == 1
@@ -2,8 +2,13 @@
 Tests para endpoints de jugador.
 """
 import pytest
+from typing import List
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 from app.main import app
+from app.api.player import _build_available_fleets_payload
+from app.models.board import AvailableFleetResponse
+import app.storage.in_memory_store as store
 
 
 client = TestClient(app)
@@ -86,6 +91,38 @@ class TestPlayerAvailableFleets:
         assert response.status_code == 401
 
 
+class TestAvailableFleetsCache:
+    """Tests de la caché del listado de flotas entre tests."""
+    
+    def test_cache_filled_with_fleet(self, clean_storage):
+        """El listado cacheado incluye la flota creada en este test."""
+        template = store.create_ship_template("Ship", 3, None, "admin")
+        store.create_base_fleet("Fleet1", 10, [template.id], "admin")
+        
+        payload = _build_available_fleets_payload(store.get_catalog_version())
+        
+        assert b"Fleet1" in payload
+    
+    def test_cache_not_reused_after_cleanup(self, clean_storage):
+        """Con el almacenamiento limpio no se sirve el listado del test anterior."""
+        payload = _build_available_fleets_payload(store.get_catalog_version())
+        
+        assert payload == b"[]"
+    
+    def test_cached_payload_matches_declared_schema(self, clean_storage):
+        """El listado cacheado cumple el esquema documentado del endpoint."""
+        template = store.create_ship_template("Ship", 3, None, "admin")
+        store.create_base_fleet("Fleet1", 10, [template.id, template.id], "admin")
+        
+        payload = _build_available_fleets_payload(store.get_catalog_version())
+        fleets = TypeAdapter(List[AvailableFleetResponse]).validate_json(payload)
+        
+        assert [ship.id for ship in fleets[0].ships] == [template.id, template.id]
+        schema = app.openapi()["paths"]["/api/player/available-fleets"]["get"]
+        items = schema["responses"]["200"]["content"]["application/json"]["schema"]["items"]
+        assert items["$ref"].endswith("/AvailableFleetResponse")
+
+
 class TestPlayerMyGames:
     """Tests de mis partidas."""
     
@@ -103,8 +140,55 @@ class TestPlayerMyGames:
         assert data["total"] == 0
         assert len(data["games"]) == 0
     
+    def test_my_games_filtered_by_status(self, clean_storage):
+        """Filtrar por estado conserva el orden del listado completo."""
+        player_token = get_player_token(clean_storage)
+        headers = {"Authorization": f"Bearer {player_token}"}
+        player_id = store.get_user_by_username("player1").id
+        first = store.create_game(player_id, "fleet", 5, None, None)
+        second = store.create_game(player_id, "fleet", 5, None, None)
+        store.create_game(player_id, "fleet", 5, None, None)
+        store.update_game_status(second.id, "finished")
+        store.update_game_status(first.id, "finished")
+        
+        response = client.get("/api/player/my-games", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["total"] == 3
+        
+        response = client.get(
+            "/api/player/my-games",
+            headers=headers,
+            params={"status": "finished"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert [g["id"] for g in data["games"]] == [first.id, second.id]
+    
     def test_my_games_without_auth(self, clean_storage):
         """Intentar listar partidas sin autenticación."""
         response = client.get("/api/player/my-games")
         
         assert response.status_code == 401
+
+
+class TestPlayerAvailableMultiplayerGames:
+    """Tests del lobby multijugador."""
+    
+    def test_unchanged_lobby_returns_not_modified(self, clean_storage):
+        """Consultar de nuevo con el mismo ETag retorna 304 sin cuerpo."""
+        player_token = get_player_token(clean_storage)
+        headers = {"Authorization": f"Bearer {player_token}"}
+        
+        response = client.get("/api/player/available-multiplayer-games", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        
+        response = client.get(
+            "/api/player/available-multiplayer-games",
+            headers={**headers, "If-None-Match": etag}
+        )
+        
+        assert response.status_code == 304
+        assert response.content == b""
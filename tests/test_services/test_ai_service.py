@@ -0,0 +1,142 @@
+"""
+Tests para AIService.
+"""
+import pytest
+from app.services.ai_service import AIService
+from app.structures.coordinate_utils import ROW_LETTERS, coordinate_to_code
+
+
+# Flotas por tamaño de tablero (sin superar el 20% de las celdas)
+FLEETS = {
+    5: [3, 2],
+    9: [4, 3, 3, 2, 2],
+    10: [5, 4, 3, 3, 2],
+    20: [5, 5, 4, 4, 3, 3, 2, 2]
+}
+
+
+def cell_index(coordinate: str, board_size: int) -> int:
+    """Helper: índice de celda (fila a fila) de una coordenada."""
+    row = ROW_LETTERS.index(coordinate[0])
+    col = int(coordinate[1:]) - 1
+    return row * board_size + col
+
+
+def fire_until_full(board_size: int, difficulty: str) -> list[str]:
+    """Helper: la IA dispara hasta cubrir el tablero, sin impactos."""
+    shot_cells = bytearray(board_size * board_size)
+    shots = []
+    for _ in range(board_size * board_size):
+        coordinate = AIService.get_next_shot(board_size, shot_cells, [], difficulty)
+        shot_cells[cell_index(coordinate, board_size)] = 1
+        shots.append(coordinate)
+    return shots
+
+
+class TestAIServicePlaceShips:
+    """Tests de colocación aleatoria de barcos."""
+    
+    @pytest.mark.parametrize("board_size", sorted(FLEETS))
+    def test_place_ships_randomly_legal_fleet(self, board_size):
+        """Cada barco queda en línea recta, dentro del tablero y sin solaparse."""
+        templates = [
+            {"id": f"t{i}", "size": size}
+            for i, size in enumerate(FLEETS[board_size])
+        ]
+        occupied = set()
+        
+        placements = AIService.place_ships_randomly(templates, board_size, occupied)
+        
+        assert [p["template_id"] for p in placements] == [t["id"] for t in templates]
+        cells = set()
+        for template, placement in zip(templates, placements):
+            coordinates = placement["coordinates"]
+            assert len(coordinates) == template["size"]
+            assert placement["start"] == coordinates[0]
+            
+            indices = [cell_index(coord, board_size) for coord in coordinates]
+            assert all(0 <= i < board_size * board_size for i in indices)
+            step = 1 if placement["orientation"] == "horizontal" else board_size
+            assert indices == list(range(indices[0], indices[0] + step * len(indices), step))
+            if step == 1:
+                assert len({i // board_size for i in indices}) == 1
+            
+            assert cells.isdisjoint(indices)
+            cells.update(indices)
+        
+        assert occupied == {
+            coordinate_to_code(coord, board_size)
+            for placement in placements for coord in placement["coordinates"]
+        }
+    
+    def test_place_ships_avoids_occupied_cells(self):
+        """Los barcos no se colocan sobre celdas ya ocupadas."""
+        board_size = 5
+        taken = {coordinate_to_code(f"{row}{col}", board_size) for row in "ABCD" for col in range(1, 6)}
+        
+        placements = AIService.place_ships_randomly([{"id": "t1", "size": 5}], board_size, set(taken))
+        
+        assert placements[0]["coordinates"] == ["E1", "E2", "E3", "E4", "E5"]
+    
+    def test_place_ships_impossible_fleet_raises(self):
+        """Un barco que no cabe en ninguna orientación produce un error."""
+        with pytest.raises(Exception):
+            AIService.place_ships_randomly([{"id": "t1", "size": 6}], 5)
+
+
+class TestAIServiceNextShot:
+    """Tests de selección de disparos de la IA."""
+    
+    @pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+    @pytest.mark.parametrize("board_size", [5, 10])
+    def test_never_repeats_and_stays_on_board(self, board_size, difficulty):
+        """La IA cubre todo el tablero sin repetir disparos."""
+        shots = fire_until_full(board_size, difficulty)
+        
+        assert len(set(shots)) == board_size * board_size
+        assert all(0 <= cell_index(coord, board_size) < board_size * board_size for coord in shots)
+    
+    def test_full_board_raises(self):
+        """Sin celdas libres no hay disparo posible."""
+        with pytest.raises(Exception):
+            AIService.get_next_shot(5, bytearray([1] * 25), [], "easy")
+    
+    def test_hard_search_uses_checkerboard(self):
+        """Sin impactos, la dificultad difícil dispara en patrón de ajedrez."""
+        shot_cells = bytearray(100)
+        for _ in range(50):
+            coordinate = AIService.get_next_shot(10, shot_cells, [], "hard")
+            row = ROW_LETTERS.index(coordinate[0]) + 1
+            assert (row + int(coordinate[1:])) % 2 == 0
+            shot_cells[cell_index(coordinate, 10)] = 1
+    
+    @pytest.mark.parametrize("last_hit, neighbours", [
+        ("C3", {"B3", "D3", "C2", "C4"}),
+        ("A1", {"A2", "B1"}),
+        ("E5", {"D5", "E4"})
+    ])
+    def test_hunt_mode_targets_neighbours(self, last_hit, neighbours):
+        """Tras un impacto, la dificultad difícil dispara a un vecino libre."""
+        shot_cells = bytearray(25)
+        shot_cells[cell_index(last_hit, 5)] = 1
+        
+        for _ in range(20):
+            assert AIService.get_next_shot(5, shot_cells, [last_hit], "hard") in neighbours
+    
+    def test_hunt_mode_skips_shot_neighbours(self):
+        """Los vecinos ya disparados no se vuelven a elegir."""
+        shot_cells = bytearray(25)
+        for coordinate in ("C3", "B3", "D3", "C2"):
+            shot_cells[cell_index(coordinate, 5)] = 1
+        
+        assert AIService.get_next_shot(5, shot_cells, ["C3"], "hard") == "C4"
+    
+    def test_hunt_mode_falls_back_when_surrounded(self):
+        """Sin vecinos libres, la IA vuelve al modo búsqueda."""
+        shot_cells = bytearray(25)
+        for coordinate in ("C3", "B3", "D3", "C2", "C4"):
+            shot_cells[cell_index(coordinate, 5)] = 1
+        
+        coordinate = AIService.get_next_shot(5, shot_cells, ["C3"], "hard")
+        
+        assert not shot_cells[cell_index(coordinate, 5)]
@@ -1,8 +1,10 @@
 """
 Tests para BoardService.
 """
+import base64
 import pytest
 from app.services.board_service import BoardService
+from app.storage.data_models import ShotData
 from app.structures.binary_search_tree import BinarySearchTree
 
 
@@ -23,6 +25,19 @@ class TestBoardServiceCreateBalancedBST:
         
         assert bst.size() == 25
     
+    def test_bst_nodes_built_on_first_access(self):
+        """Los nodos del ABB se crean al acceder a la raíz, no al disparar."""
+        bst = BoardService.create_balanced_bst(5)
+        
+        BoardService.mark_coordinate_as_shot(bst, "B2", 5)
+        assert BoardService.get_board_statistics(bst)["shot_cells"] == 1
+        assert bst.nodes_built is False
+        
+        assert bst.search(22) is not None
+        assert bst.nodes_built is True
+        assert bst.size() == 25
+        assert BoardService.get_all_shots(bst, 5)[0]["coordinate"] == "B2"
+    
     def test_bst_contains_all_coordinates(self):
         """Verificar que el ABB contiene todas las coordenadas."""
         bst = BoardService.create_balanced_bst(3)
@@ -75,6 +90,42 @@ class TestBoardServiceMarkCoordinateAsShot:
         # Ahora debe estar disparada
         assert BoardService.is_coordinate_shot(bst, "A1") is True
 
+    def test_try_mark_coordinate_as_shot(self):
+        """Solo el primer disparo a una coordenada la marca."""
+        bst = BoardService.create_balanced_bst(10)
+
+        assert BoardService.try_mark_coordinate_as_shot(bst, "C4") is True
+        assert BoardService.try_mark_coordinate_as_shot(bst, "C4") is False
+        assert BoardService.get_board_statistics(bst)["shot_cells"] == 1
+
+    def test_try_mark_coordinate_as_shot_generic_bst(self):
+        """En un ABB genérico también se marca solo el primer disparo."""
+        from app.structures.abb_node import Node
+        
+        bst = BinarySearchTree()
+        for code in (202, 101, 303):
+            bst.insert(Node(id=code))
+        
+        assert BoardService.try_mark_coordinate_as_shot(bst, "B2") is True
+        assert BoardService.try_mark_coordinate_as_shot(bst, "B2") is False
+        assert BoardService.is_coordinate_shot(bst, "B2") is True
+        assert BoardService.is_coordinate_shot(bst, "A1") is False
+    
+    def test_mark_lowercase_coordinate_as_shot(self):
+        """Las coordenadas en minúsculas marcan la misma celda."""
+        bst = BoardService.create_balanced_bst(10)
+
+        BoardService.mark_coordinate_as_shot(bst, "j10")
+
+        assert BoardService.is_coordinate_shot(bst, "J10") is True
+
+    def test_is_coordinate_shot_invalid_coordinate(self):
+        """Una coordenada fuera del tablero sigue lanzando ValueError."""
+        bst = BoardService.create_balanced_bst(5)
+
+        with pytest.raises(ValueError):
+            BoardService.is_coordinate_shot(bst, "F1", 5)
+
 
 class TestBoardServiceValidateCoordinate:
     """Tests de validación de coordenadas."""
@@ -120,9 +171,19 @@ class TestBoardServiceCalculateShipCoordinates:
         is_valid, coords, msg = BoardService.calculate_ship_coordinates(
             "A9", 3, "horizontal", 10
         )
-        
+
+        assert is_valid is False
+        assert coords == []
+
+    def test_calculate_ship_invalid_start(self):
+        """Una coordenada inicial fuera del tablero reporta ese error."""
+        is_valid, coords, msg = BoardService.calculate_ship_coordinates(
+            "F1", 2, "horizontal", 5
+        )
+
         assert is_valid is False
         assert coords == []
+        assert msg == "Coordenada 'F1' fuera del tablero 5x5"
 
 
 class TestBoardServiceCheckCoordinatesAvailable:
@@ -165,6 +226,17 @@ class TestBoardServiceMarkCoordinatesOccupied:
         # Verificar que están marcadas
         is_available, _ = BoardService.check_coordinates_available(coords, bst)
         assert is_available is False
+    
+    def test_mark_coordinates_occupied_small_board(self):
+        """Ocupación en tablero menor a 10 (códigos con multiplicador 10)."""
+        bst = BoardService.create_balanced_bst(6)
+        
+        BoardService.mark_coordinates_occupied(["F5", "F6"], bst, "ship_ref")
+        
+        is_available, msg = BoardService.check_coordinates_available(["F4", "F5"], bst)
+        assert is_available is False
+        assert "F5" in msg
+        assert BoardService.check_coordinates_available(["A1", "F4"], bst) == (True, "")
 
 
 class TestBoardServiceGetBoardStatistics:
@@ -193,3 +265,39 @@ class TestBoardServiceGetBoardStatistics:
         assert stats["total_cells"] == 25
         assert stats["shot_cells"] == 2
         assert stats["remaining_cells"] == 23
+    
+    def test_get_board_statistics_repeated_shot(self):
+        """Disparar dos veces la misma celda cuenta una sola vez."""
+        bst = BoardService.create_balanced_bst(5)
+        
+        BoardService.mark_coordinate_as_shot(bst, "C3", 5)
+        BoardService.mark_coordinate_as_shot(bst, "C3", 5)
+        
+        stats = BoardService.get_board_statistics(bst)
+        
+        assert stats["shot_cells"] == 1
+        assert stats["remaining_cells"] == 24
+
+
+class TestBoardServiceBuildCompactBoard:
+    """Tests del tablero compacto en mapas de bits."""
+    
+    def test_build_compact_board_bits(self):
+        """Cada celda se marca en el bit (fila-1)*N + (columna-1)."""
+        shots = [
+            ShotData(coordinate="A2", coordinate_code=12, result="hit"),
+            ShotData(coordinate="E5", coordinate_code=55, result="water")
+        ]
+        
+        board = BoardService.build_compact_board(5, [11, 12], shots)
+        
+        has_ship = base64.b64decode(board["has_ship_bits"])
+        is_shot = base64.b64decode(board["is_shot_bits"])
+        is_hit = base64.b64decode(board["is_hit_bits"])
+        
+        assert board["board_size"] == 5
+        assert len(has_ship) == 4  # 25 celdas -> 4 bytes
+        assert has_ship == bytes([0b11, 0, 0, 0])
+        assert is_shot == bytes([0b10, 0, 0, 0b1])  # A2 -> bit 1, E5 -> bit 24
+        assert is_hit == bytes([0b10, 0, 0, 0])
+
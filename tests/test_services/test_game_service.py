@@ -41,6 +41,19 @@ class TestGameServiceValidations:
         is_valid, msg = GameService.validate_fleet_fits_board(10, ship_sizes)
         
         assert is_valid is True
+    
+    def test_check_game_finished(self):
+        """La partida termina cuando todos los barcos están hundidos."""
+        from app.services.ship_service import ShipService
+        
+        tree = ShipService.create_fleet_tree("player-123")
+        first = tree.add_child(tree.root, {"type": "ship", "is_sunk": True})
+        second = tree.add_child(tree.root, {"type": "ship", "is_sunk": False})
+        
+        assert GameService.check_game_finished(tree) is False
+        second.data["is_sunk"] = True
+        assert GameService.check_game_finished(tree) is True
+        assert first.data["is_sunk"] is True
 
 
 class TestGameServiceCreateGame:
@@ -56,6 +56,41 @@ def test_fleet():
     return fleet
 
 
+def start_battle(test_users, fleet, placements):
+    """
+    Helper: crea una partida multijugador, une al jugador 2 y coloca la
+    misma flota para ambos jugadores.
+    
+    Args:
+        test_users: Usuarios de prueba
+        fleet: Flota base de la partida
+        placements: Tuplas (template_id, coordenada, orientación)
+    
+    Returns:
+        Tupla (game_id, player1_id, player2_id)
+    """
+    player1_id = test_users["player1"].id
+    player2_id = test_users["player2"].id
+    game_id = GameService.create_new_game(player1_id, fleet.id, is_multiplayer=True)["game_id"]
+    GameService.join_game(game_id, player2_id)
+    
+    for player_id in (player1_id, player2_id):
+        for template_id, coordinate, orientation in placements:
+            GameService.place_ship(game_id, player_id, template_id, coordinate, orientation)
+    
+    return game_id, player1_id, player2_id
+
+
+@pytest.fixture
+def battle(test_users, test_fleet):
+    """Partida multijugador con la flota de prueba colocada por ambos jugadores."""
+    lancha_id, submarino_id = test_fleet.ship_template_ids
+    return start_battle(test_users, test_fleet, [
+        (lancha_id, "A1", "horizontal"),
+        (submarino_id, "C1", "vertical")
+    ])
+
+
 class TestMultiplayerGameCreation:
     """Tests de creación de partidas multijugador."""
     
@@ -397,6 +432,89 @@ class TestMultiplayerGameStats:
         assert stats["total_shots"] == 0
 
 
+class TestMultiplayerFireShot:
+    """Tests de disparos en modo multijugador."""
+    
+    def test_fire_shot_hits_and_sinks_ship(self, battle):
+        """Los impactos se resuelven sobre el barco colocado en esa celda."""
+        game_id, player1_id, player2_id = battle
+        
+        success, _, first = GameService.fire_shot(game_id, "A2", player1_id)
+        assert success is True
+        assert first["result"] == "hit"
+        assert first["ship_hit"] == "Lancha"
+        
+        GameService.fire_shot(game_id, "E5", player2_id)
+        _, _, second = GameService.fire_shot(game_id, "A1", player1_id)
+        assert second["result"] == "sunk"
+        assert second["ship_sunk"] is True
+        assert second["game_won"] is False
+        
+        game = get_game(game_id)
+        assert game.player2_ships[0].is_sunk is True
+        assert game.player2_ships[1].is_sunk is False
+        assert game.player1_ships[0].is_sunk is False
+    
+    def test_sinking_last_ship_wins_game(self, battle):
+        """Hundir el último barco a flote termina la partida."""
+        game_id, player1_id, player2_id = battle
+        
+        assert get_game(game_id).player2_ships_afloat == 2
+        
+        misses = iter(["E5", "E4", "E3", "E2"])
+        targets = ["A1", "A2", "C1", "D1", "E1"]
+        for target in targets:
+            _, _, shot = GameService.fire_shot(game_id, target, player1_id)
+            if target != targets[-1]:
+                assert shot["game_won"] is False
+                GameService.fire_shot(game_id, next(misses), player2_id)
+        
+        game = get_game(game_id)
+        assert shot["game_won"] is True
+        assert game.player2_ships_afloat == 0
+        assert game.status == "player1_won"
+        assert game.winner == player1_id
+        assert game.finished_at is not None
+    
+    def test_stats_count_sunk_ships_for_both_players(self, battle):
+        """Los barcos hundidos se reflejan en las estadísticas de ambos jugadores."""
+        game_id, player1_id, player2_id = battle
+        
+        GameService.fire_shot(game_id, "A1", player1_id)
+        GameService.fire_shot(game_id, "A1", player2_id)
+        GameService.fire_shot(game_id, "A2", player1_id)
+        GameService.fire_shot(game_id, "E5", player2_id)
+        
+        game = get_game(game_id)
+        player1_stats = game.get_stats(player1_id)
+        player2_stats = game.get_stats(player2_id)
+        
+        assert player1_stats["enemy_ships_sunk"] == 1
+        assert player1_stats["ships_sunk"] == 0
+        assert player1_stats["ships_remaining"] == 2
+        assert player2_stats["ships_sunk"] == 1
+        assert player2_stats["ships_remaining"] == 1
+        assert player2_stats["enemy_ships_sunk"] == 0
+        assert (player2_stats["hits"], player2_stats["misses"]) == (1, 1)
+    
+    def test_fire_shot_fleet_with_repeated_template(self, test_users):
+        """Con plantillas repetidas el impacto va al barco de esa celda."""
+        boat = create_ship_template("Lancha", 2, "Barco pequeño", "admin")
+        fleet = create_base_fleet("Flota de Lanchas", 5, [boat.id, boat.id], "admin")
+        game_id, player1_id, player2_id = start_battle(test_users, fleet, [
+            (boat.id, "A1", "horizontal"),
+            (boat.id, "C1", "horizontal")
+        ])
+        
+        GameService.fire_shot(game_id, "C1", player1_id)
+        GameService.fire_shot(game_id, "E5", player2_id)
+        _, _, shot = GameService.fire_shot(game_id, "C2", player1_id)
+        
+        game = get_game(game_id)
+        assert shot["result"] == "sunk"
+        assert [ship.is_sunk for ship in game.player2_ships] == [False, True]
+
+
 class TestMultiplayerVsAICompatibility:
     """Tests de compatibilidad con modo vs IA."""
     
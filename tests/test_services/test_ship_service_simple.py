@@ -3,6 +3,34 @@ Tests simplificados para ShipService.
 """
 import pytest
 from app.services.ship_service import ShipService
+from app.storage.data_models import ShipInstanceData, ShipSegmentData
+
+
+def build_indexed_ship(ship_name: str, segments: list[tuple[str, int]]):
+    """
+    Helper: agrega un barco a un árbol de flota nuevo e indexa sus segmentos.
+    
+    Args:
+        ship_name: Nombre del barco
+        segments: Pares (coordenada, código) de cada segmento
+    
+    Returns:
+        Tupla (árbol, barco, nodo del barco, índice de segmentos)
+    """
+    ship = ShipInstanceData(
+        ship_template_id="t1",
+        ship_name=ship_name,
+        size=len(segments),
+        segments=[
+            ShipSegmentData(coordinate=coordinate, coordinate_code=code)
+            for coordinate, code in segments
+        ]
+    )
+    tree = ShipService.create_fleet_tree("player-123")
+    ship_node = ShipService.add_ship_to_fleet(tree, ship)
+    index = {}
+    ShipService.index_ship_segments(index, ship, ship_node)
+    return tree, ship, ship_node, index
 
 
 class TestShipServiceBasics:
@@ -39,3 +67,49 @@ class TestShipServiceBasics:
         assert ship_instance.ship_name == "Portaaviones"
         assert ship_instance.size == 5
         assert len(ship_instance.segments) == 5
+    
+    def test_hit_indexed_segment_sinks_ship(self):
+        """El índice de segmentos marca impactos en el barco y en el árbol."""
+        tree, ship, ship_node, index = build_indexed_ship(
+            "Destructor", [("A1", 101), ("A2", 102)]
+        )
+        
+        hit_ship, is_sunk = ShipService.hit_indexed_segment(tree, index[102])
+        assert hit_ship is ship
+        assert is_sunk is False
+        assert ship.segments[1].is_hit is True
+        assert ship.remaining_segments == 1
+        assert tree.get_children(ship_node)[1].data["is_hit"] is True
+        
+        _, is_sunk = ShipService.hit_indexed_segment(tree, index[101])
+        assert is_sunk is True
+        assert ship.is_sunk is True
+        assert ship_node.data["is_sunk"] is True
+    
+    def test_get_ship_by_coordinate_vertical(self):
+        """Los segmentos de un barco vertical se localizan por desplazamiento."""
+        tree, _, ship_node, _ = build_indexed_ship(
+            "Submarino", [("B2", 202), ("C2", 302), ("D2", 402)]
+        )
+        
+        found, info = ShipService.get_ship_by_coordinate(302, tree)
+        assert found is True
+        assert info["segment_node"].data["coordinate"] == "C2"
+        assert ShipService.get_ship_by_coordinate(203, tree) == (False, None)
+        assert ShipService.get_ship_by_coordinate(502, tree) == (False, None)
+        
+        assert ShipService.mark_segment_as_hit(ship_node, 402) is False
+        assert tree.get_children(ship_node)[2].data["is_hit"] is True
+    
+    def test_hit_indexed_segment_repeated_hit_counts_once(self):
+        """Impactar dos veces el mismo segmento no descuenta dos veces."""
+        tree, ship, _, index = build_indexed_ship(
+            "Destructor", [("A1", 11), ("A2", 12)]
+        )
+        
+        ShipService.hit_indexed_segment(tree, index[11])
+        _, is_sunk = ShipService.hit_indexed_segment(tree, index[11])
+        
+        assert is_sunk is False
+        assert ship.remaining_segments == 1
+        assert ship.is_sunk is False
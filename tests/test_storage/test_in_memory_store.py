@@ -4,9 +4,10 @@ Valida las operaciones CRUD en los diccionarios globales.
 """
 import pytest
 from datetime import datetime
+from functools import lru_cache
 
 import app.storage.in_memory_store as store
-from app.storage.data_models import User, ShipTemplate, BaseFleet
+from app.storage.data_models import User, ShipTemplate, BaseFleet, ShotData
 
 
 class TestDefaultAdmin:
@@ -168,6 +169,14 @@ class TestFindUserById:
         """Buscar usuario que no existe."""
         found = store.get_user_by_id("non-existent-id")
         assert found is None
+    
+    def test_get_username_not_stale(self, clean_storage):
+        """Un ID consultado antes de existir se resuelve al crearse el usuario."""
+        assert store.get_username("user-1") is None
+        
+        store.users_db["user-1"] = User("user-1", "marina", "hash", "player")
+        
+        assert store.get_username("user-1") == "marina"
 
 
 class TestFindUserByUsername:
@@ -365,6 +374,149 @@ class TestBaseFleetOperations:
         assert found is None
 
 
+class TestWaitingMultiplayerGames:
+    """Tests del índice de partidas multijugador en espera."""
+    
+    def test_waiting_games_newest_first(self, clean_storage):
+        """Las partidas en espera se recorren de la más reciente a la más antigua."""
+        games = [
+            store.create_game("p1", "fleet", 5, None, None, is_multiplayer=True)
+            for _ in range(3)
+        ]
+        store.create_game("p1", "fleet", 5, None, None, is_multiplayer=False)
+        
+        waiting = list(store.get_waiting_multiplayer_games())
+        assert [g.id for g in waiting] == [g.id for g in reversed(games)]
+    
+    def test_joined_game_leaves_index(self, clean_storage):
+        """Una partida deja el índice cuando se une el jugador 2."""
+        game = store.create_game("p1", "fleet", 5, None, None, is_multiplayer=True)
+        
+        store.join_game_as_player2(game.id, "p2", None, None)
+        
+        assert list(store.get_waiting_multiplayer_games()) == []
+
+
+class TestPlayerGamesByStatus:
+    """Tests del índice de partidas por (jugador, estado)."""
+    
+    def test_status_change_moves_game_between_buckets(self, clean_storage):
+        """Al cambiar de estado la partida sale del bucket anterior."""
+        game = store.create_game("p1", "fleet", 5, None, None)
+        
+        store.update_game_status(game.id, "finished")
+        
+        assert store.get_player_games("p1", "setup") == []
+        assert store.get_player_games("p1", "finished") == [game]
+    
+    def test_filtered_games_keep_creation_order(self, clean_storage):
+        """El listado filtrado conserva el orden del listado sin filtro."""
+        games = [store.create_game("p1", "fleet", 5, None, None) for _ in range(3)]
+        
+        for index in (1, 2, 0):
+            store.update_game_status(games[index].id, "finished")
+        
+        assert store.get_player_games("p1") == games
+        assert store.get_player_games("p1", "finished") == games
+    
+    def test_join_indexes_player2(self, clean_storage):
+        """El jugador 2 ve la partida en su estado actual al unirse."""
+        game = store.create_game("p1", "fleet", 5, None, None, is_multiplayer=True)
+        
+        store.join_game_as_player2(game.id, "p2", None, None)
+        
+        assert store.get_player_games("p1", "waiting_for_player2") == []
+        assert store.get_player_games("p1", game.status) == [game]
+        assert store.get_player_games("p2", game.status) == [game]
+    
+    def test_deleted_game_leaves_index(self, clean_storage):
+        """Una partida eliminada desaparece de los listados de ambos jugadores."""
+        game = store.create_game("p1", "fleet", 5, None, None, is_multiplayer=True)
+        store.join_game_as_player2(game.id, "p2", None, None)
+        status = game.status
+        
+        store.delete_game(game.id)
+        
+        for player_id in ("p1", "p2"):
+            assert store.get_player_games(player_id) == []
+            assert store.get_player_games(player_id, status) == []
+
+
+class TestShotHistory:
+    """Tests del historial de disparos de una partida."""
+    
+    def test_shot_dicts_serialized_on_read(self, clean_storage):
+        """La hora se formatea al leer el historial, una vez por disparo."""
+        game = store.create_game("p1", "fleet", 5, None, None)
+        stamp = datetime(2024, 1, 1, 12, 0, 0).timestamp()
+        
+        game.record_shot(True, ShotData("A1", 11, "water", stamp))
+        assert game.player1_shot_dicts == ()
+        first = game.get_shot_dicts(True)
+        assert first == ({
+            "coordinate": "A1",
+            "coordinate_code": 11,
+            "result": "water",
+            "timestamp": "2024-01-01T12:00:00"
+        },)
+        
+        game.record_shot(True, ShotData("B2", 22, "hit", stamp))
+        shots = game.get_shot_dicts(True)
+        assert [shot["coordinate"] for shot in shots] == ["A1", "B2"]
+        assert shots[0] is first[0]
+        assert first == game.get_shot_dicts(True)[:1]
+        assert game.get_shot_dicts(False) == ()
+    
+    def test_shots_numbered_per_game(self, clean_storage):
+        """Cada disparo recibe la siguiente secuencia de la partida."""
+        game = store.create_game("p1", "fleet", 5, None, None)
+        
+        game.record_shot(True, ShotData("A1", 11, "water"))
+        game.record_shot(False, ShotData("B2", 22, "hit"))
+        game.record_shot(True, ShotData("C3", 33, "water"))
+        
+        assert [shot.monotonic_seq for shot in game.player1_shots] == [0, 2]
+        assert [shot.monotonic_seq for shot in game.player2_shots] == [1]
+        assert game.next_shot_seq == 3
+
+
+class TestStorageReset:
+    """Tests del vaciado y la restauración del almacenamiento."""
+    
+    def test_reset_clears_indexes_and_caches(self, clean_storage):
+        """reset vacía datos, índices y cachés derivadas registradas."""
+        store.create_game("p1", "fleet", 5, None, None, is_multiplayer=True)
+        waiting_version = store.get_waiting_games_version()
+        calls = []
+        
+        @store.register_derived_cache
+        @lru_cache(maxsize=1)
+        def cached() -> int:
+            calls.append(None)
+            return len(calls)
+        
+        try:
+            cached()
+            store.reset()
+            
+            assert all(len(container) == 0 for container in store.snapshot())
+            assert store.get_waiting_games_version() != waiting_version
+            assert cached() == 2
+        finally:
+            store._derived_caches.remove(cached)
+    
+    def test_restore_returns_saved_state(self, clean_storage):
+        """restore deja el almacenamiento como estaba al hacer snapshot."""
+        game = store.create_game("p1", "fleet", 5, None, None)
+        saved = store.snapshot()
+        
+        store.reset()
+        store.restore(saved)
+        
+        assert store.get_game(game.id) is game
+        assert store.get_player_games("p1", "setup") == [game]
+
+
 class TestCleanStorageFixture:
     """Tests de la fixture clean_storage."""
     
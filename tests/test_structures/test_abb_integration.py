@@ -128,6 +128,21 @@ class TestABBBalancedInsertion:
         expected_height = math.ceil(math.log2(25))
         assert height <= expected_height + 2  # Permitir margen de error
     
+    def test_abb_build_from_sorted_matches_balanced_insertion(self):
+        """Construir desde nodos ordenados da el mismo árbol que la inserción balanceada."""
+        coords = generate_coordinate_codes(5)
+
+        inserted = BinarySearchTree()
+        for code in balance_array_for_bst(coords):
+            inserted.insert(Node(id=code))
+
+        built = BinarySearchTree()
+        built.build_from_sorted([Node(id=code) for code in coords])
+
+        assert built.size() == 25
+        assert built.preOrder() == inserted.preOrder()
+        assert built.search(33) is not None
+
     def test_abb_insertion_order_matters(self):
         """Verificar que el orden de inserción afecta el balance."""
         # Inserción secuencial (peor caso)
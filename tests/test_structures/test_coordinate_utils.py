@@ -10,6 +10,8 @@ from app.structures.coordinate_utils import (
     generate_coordinate_codes,
     validate_coordinate,
     get_adjacent_coordinates,
+    get_ship_codes,
+    resolve_coordinate,
     coordinates_overlap
 )
 
@@ -203,6 +205,41 @@ class TestAdjacentCoordinates:
         with pytest.raises(ValueError):
             get_adjacent_coordinates("A1", 10, "diagonal", 3)
 
+    def test_get_ship_codes_horizontal(self):
+        """Los códigos horizontales avanzan de columna en columna."""
+        assert get_ship_codes("B2", 10, "horizontal", 3) == [202, 203, 204]
+    
+    def test_get_ship_codes_vertical_small_board(self):
+        """Los códigos verticales avanzan según el multiplicador del tablero."""
+        assert get_ship_codes("A3", 5, "vertical", 3) == [13, 23, 33]
+    
+    def test_get_ship_codes_with_start_code(self):
+        """Con el código inicial ya resuelto se obtienen las mismas celdas."""
+        assert get_ship_codes("C8", 10, "horizontal", 3, start_code=308) == [308, 309, 310]
+        with pytest.raises(ValueError):
+            get_ship_codes("C9", 10, "horizontal", 3, start_code=309)
+
+
+class TestResolveCoordinate:
+    """Tests de resolución de coordenadas con la tabla del tablero."""
+    
+    def test_resolve_coordinate_shares_string(self):
+        """Las coordenadas del tablero devuelven siempre la misma cadena."""
+        first, code = resolve_coordinate("".join(["B", "3"]), 10)
+        second, _ = resolve_coordinate("".join(["B", "3"]), 10)
+        
+        assert (first, code) == ("B3", 203)
+        assert first is second
+    
+    def test_resolve_coordinate_lowercase(self):
+        """Las coordenadas fuera de la tabla usan coordinate_to_code."""
+        assert resolve_coordinate("b3", 5) == ("b3", 23)
+    
+    def test_resolve_coordinate_invalid(self):
+        """Una coordenada inválida lanza ValueError."""
+        with pytest.raises(ValueError):
+            resolve_coordinate("Z99", 10)
+
 
 class TestCoordinatesOverlap:
     """Tests de detección de superposición de coordenadas."""